@@ -0,0 +1,240 @@
+# Sudoku Solver package
+# Eight search algorithms behind one solve(puzzle, method=...) entry point.
+#
+# Importing the package does no solving and no file I/O, and the solver
+# modules (including the NumPy-based ones) are only imported the first
+# time they are used.
+
+import importlib
+
+from .budget import Budget, BudgetExhausted, Exhausted
+from .grid import box_side, is_solution, to_board, to_string
+from .stats import SearchStats
+
+MODULES = (
+    'annealing',
+    'astar',
+    'backtracking',
+    'batch',
+    'benchmark',
+    'bfs',
+    'cache',
+    'csp',
+    'dataset',
+    'dlx',
+    'forward_checking',
+    'generator',
+    'genetic',
+    'hill_climbing',
+    'portfolio',
+    'service',
+    'vectorized',
+)
+
+# -----------------------------
+# per-method adapters
+# -----------------------------
+# Each adapter takes a fresh list of lists of ints, an optional SearchStats
+# and an optional Budget, and returns the solved board, or None when the
+# method finds no solution. Boards are 9x9 except for the methods in
+# ANY_SIZE. The exact methods raise BudgetExhausted when the budget runs
+# out; the local searches return an Exhausted with their best grid.
+
+def _exhausted(budget, grid, conflicts):
+    if budget is not None and budget.exhausted:
+        return Exhausted(budget.reason, grid, conflicts)
+    return None
+
+
+def _csp(board, stats, budget):
+    from . import csp
+    n = box_side(len(board) ** 2)
+    values = csp.solve(to_string(board), stats, n, budget)
+    if not values:
+        return None
+    return to_board(''.join(values[b] for b in csp.tables(n).boxes))
+
+
+def _dlx(board, stats, budget):
+    from . import dlx
+    values = dlx.solve(to_string(board), stats, budget)
+    if not values:
+        return None
+    return to_board(''.join(values[b] for b in dlx.boxes))
+
+
+def _forward_checking(board, stats, budget):
+    from . import forward_checking
+    domains = forward_checking.init_domains(board)
+    if forward_checking.solve(board, domains, stats, budget=budget):
+        return board
+    return None
+
+
+def _mac(board, stats, budget):
+    from . import forward_checking
+    domains = forward_checking.init_domains(board)
+    if forward_checking.solve(board, domains, stats, mode='mac', budget=budget):
+        return board
+    return None
+
+
+def _forward_checking_cbj(board, stats, budget):
+    from . import forward_checking
+    domains = forward_checking.init_domains(board)
+    if forward_checking.solve(board, domains, stats, budget=budget, backjump=True):
+        return board
+    return None
+
+
+def _backtracking(board, stats, budget):
+    from . import backtracking
+    if backtracking.solveSudoku(board, stats, budget):
+        return board
+    return None
+
+
+def _astar(board, stats, budget):
+    from . import astar
+    return astar.a_star_sudoku(board, stats, budget)
+
+
+def _ida_star(board, stats, budget):
+    from . import astar
+    return astar.ida_star_sudoku(board, stats, budget)
+
+
+def _bfs(board, stats, budget):
+    from . import bfs
+    return bfs.bfs_sudoku_solver(board, stats, budget=budget)
+
+
+def _hill_climbing(board, stats, budget):
+    from . import hill_climbing
+    current, conflicts = hill_climbing.hill_climbing_sudoku(board, stats, budget=budget)
+    return current if conflicts == 0 else _exhausted(budget, current, conflicts)
+
+
+def _hill_climbing_restarts(board, stats, budget):
+    from . import hill_climbing
+    current, conflicts = hill_climbing.random_restarts(board, stats=stats, budget=budget)
+    return current if conflicts == 0 else _exhausted(budget, current, conflicts)
+
+
+def _genetic(board, stats, budget):
+    from . import genetic
+    population = genetic.genetic_algorithm(board, stats, budget=budget)
+    fit = genetic.fitness(population)
+    best = population[fit.argmax()].tolist()
+    return best if fit.max() == 0 else _exhausted(budget, best, -int(fit.max()))
+
+
+def _genetic_islands(board, stats, budget):
+    from . import genetic
+    best, fit = genetic.island_genetic_algorithm(board, stats=stats, budget=budget)
+    return best.tolist() if fit == 0 else _exhausted(budget, best.tolist(), -fit)
+
+
+def _annealing(board, stats, budget):
+    import numpy as np
+    from . import annealing
+    result = annealing.solveSudoku(np.array(board), stats, budget=budget)
+    conflicts = annealing.CalculateNumberOfErrors(result)
+    return result.tolist() if conflicts == 0 else _exhausted(budget, result.tolist(), conflicts)
+
+
+METHODS = {
+    'csp': _csp,
+    'dlx': _dlx,
+    'forward_checking': _forward_checking,
+    'mac': _mac,
+    'forward_checking_cbj': _forward_checking_cbj,
+    'backtracking': _backtracking,
+    'astar': _astar,
+    'ida_star': _ida_star,
+    'bfs': _bfs,
+    'hill_climbing': _hill_climbing,
+    'hill_climbing_restarts': _hill_climbing_restarts,
+    'genetic': _genetic,
+    'genetic_islands': _genetic_islands,
+    'annealing': _annealing,
+}
+
+# methods that also solve 4x4, 16x16 and 25x25 boards
+ANY_SIZE = {'csp', 'forward_checking', 'mac', 'forward_checking_cbj', 'backtracking'}
+
+# module that implements each method
+METHOD_MODULES = {method: method for method in METHODS}
+METHOD_MODULES['ida_star'] = 'astar'
+METHOD_MODULES['mac'] = 'forward_checking'
+METHOD_MODULES['forward_checking_cbj'] = 'forward_checking'
+METHOD_MODULES['genetic_islands'] = 'genetic'
+METHOD_MODULES['hill_climbing_restarts'] = 'hill_climbing'
+
+# methods that start worker processes of their own; they cannot run inside
+# the daemonic workers of the benchmark, the portfolio race or a batch pool
+NESTED = {'genetic_islands'}
+
+# -----------------------------
+# entry point
+# -----------------------------
+"""
+puzzle may be an 81-character string ('.' or '0' for empty cells) or a
+9x9 grid of ints. Returns the solved board as a 9x9 list of ints, or None
+when the chosen method does not find a solution. The input is never
+modified. Pass a SearchStats as `stats` to collect node and backtrack
+counts. The methods in ANY_SIZE also take 16x16 and 25x25 puzzles
+(digits 1-9A-G / 1-9A-P in strings, see grid.SYMBOLS).
+
+`budget` bounds the call: a Budget, or a number of seconds. When it runs
+out first, an Exhausted result is returned instead (falsy; for the local
+searches it carries the best grid found and its conflict count).
+"""
+def solve(puzzle, method='csp', stats=None, budget=None):
+    try:
+        solver = METHODS[method]
+    except KeyError:
+        raise ValueError("unknown method %r (choose from %s)"
+                         % (method, ', '.join(sorted(METHODS)))) from None
+    board = to_board(puzzle)
+    if len(board) != 9 and method not in ANY_SIZE:
+        raise ValueError("method %r only solves 9x9 puzzles (any size: %s)"
+                         % (method, ', '.join(sorted(ANY_SIZE))))
+    if budget is not None and not isinstance(budget, Budget):
+        budget = Budget(seconds=budget)
+    try:
+        return solver(board, stats, budget)
+    except BudgetExhausted as exc:
+        return Exhausted(exc.reason)
+
+
+# Number of solutions, stopping once `limit` have been found (None = all)
+def count_solutions(puzzle, limit=2, stats=None):
+    from . import csp
+    board = to_board(puzzle)
+    return csp.count_solutions(to_string(board), limit, stats, box_side(len(board) ** 2))
+
+
+# True when the puzzle has exactly one solution
+def has_unique_solution(puzzle, stats=None):
+    from . import csp
+    board = to_board(puzzle)
+    return csp.has_unique_solution(to_string(board), stats, box_side(len(board) ** 2))
+
+
+# The solved board when the puzzle has exactly one solution, else None;
+# validates and solves in one search
+def unique_solution(puzzle, stats=None):
+    from . import csp
+    board = to_board(puzzle)
+    n = box_side(len(board) ** 2)
+    values = csp.unique_solution(to_string(board), stats, n)
+    if not values:
+        return None
+    return to_board(''.join(values[b] for b in csp.tables(n).boxes))
+
+
+def __getattr__(name):
+    if name in MODULES:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
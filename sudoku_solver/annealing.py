@@ -0,0 +1,298 @@
+import random
+import numpy as np
+import math
+from random import choice
+import statistics
+
+from .stats import phase
+
+
+def PrintSudoku(sudoku):
+    print("\n")
+    for i in range(len(sudoku)):
+        line = ""
+        if i == 3 or i == 6:
+            print("---------------------")
+        for j in range(len(sudoku[i])):
+            if j == 3 or j == 6:
+                line += "| "
+            line += str(sudoku[i, j]) + " "
+        print(line)
+
+
+def FixSudokuValues(fixed_sudoku):
+    for i in range(0, 9):
+        for j in range(0, 9):
+            if fixed_sudoku[i, j] != 0:
+                fixed_sudoku[i, j] = 1
+
+    return (fixed_sudoku)
+
+
+# Cost Function
+def CalculateNumberOfErrors(sudoku):
+    numberOfErrors = 0
+    for i in range(0, 9):
+        numberOfErrors += CalculateNumberOfErrorsRowColumn(i, i, sudoku)
+    return (numberOfErrors)
+
+
+def CalculateNumberOfErrorsRowColumn(row, column, sudoku):
+    numberOfErrors = (9 - len(np.unique(sudoku[:, column]))) + (9 - len(np.unique(sudoku[row, :])))
+    return (numberOfErrors)
+
+
+def CreateList3x3Blocks():
+    finalListOfBlocks = []
+    for r in range(0, 9):
+        tmpList = []
+        block1 = [i + 3 * ((r) % 3) for i in range(0, 3)]
+        block2 = [i + 3 * math.trunc((r) / 3) for i in range(0, 3)]
+        for x in block1:
+            for y in block2:
+                tmpList.append([x, y])
+        finalListOfBlocks.append(tmpList)
+    return (finalListOfBlocks)
+
+
+def RandomlyFill3x3Blocks(sudoku, listOfBlocks):
+    for block in listOfBlocks:
+        for box in block:
+            if sudoku[box[0], box[1]] == 0:
+                currentBlock = sudoku[block[0][0]:(block[-1][0] + 1), block[0][1]:(block[-1][1] + 1)]
+                sudoku[box[0], box[1]] = choice([i for i in range(1, 10) if i not in currentBlock])
+    return sudoku
+
+
+# Digit-count tables
+# rowCounts[r][d] / colCounts[c][d] is how often digit d appears in row r /
+# column c. Blocks always hold 1..9 exactly once (swaps stay inside a
+# block), so the cost is the number of repeats in rows and columns.
+def CountTables(board):
+    rowCounts = [[0] * 10 for _ in range(9)]
+    colCounts = [[0] * 10 for _ in range(9)]
+    for i in range(9):
+        for j in range(9):
+            rowCounts[i][board[i][j]] += 1
+            colCounts[j][board[i][j]] += 1
+    return rowCounts, colCounts
+
+
+def ErrorsFromCounts(rowCounts, colCounts):
+    return sum(9 - sum(1 for n in counts[1:] if n) for counts in rowCounts + colCounts)
+
+
+def MoveDigit(counts, src, dst, digit):
+    # move one `digit` from line src to line dst and return the cost change
+    if src == dst:
+        return 0
+    delta = 0
+    if counts[src][digit] > 1:
+        delta -= 1
+    counts[src][digit] -= 1
+    if counts[dst][digit] > 0:
+        delta += 1
+    counts[dst][digit] += 1
+    return delta
+
+
+def FreeBoxesPerBlock(fixedSudoku, listOfBlocks):
+    # blocks with fewer than two free boxes have nothing to swap
+    freeBlocks = []
+    for block in listOfBlocks:
+        free = [box for box in block if fixedSudoku[box[0], box[1]] != 1]
+        if len(free) >= 2:
+            freeBlocks.append(free)
+    return freeBlocks
+
+
+def TwoRandomBoxesWithinBlock(freeBlock):
+    return random.sample(freeBlock, 2)
+
+
+def FlipBoxes(board, rowCounts, colCounts, boxesToFlip):
+    # swap two boxes in place, keeping the count tables in step, and return
+    # the change in cost; calling it again with the same boxes reverts it
+    (r1, c1), (r2, c2) = boxesToFlip
+    v1, v2 = board[r1][c1], board[r2][c2]
+    board[r1][c1], board[r2][c2] = v2, v1
+    delta = MoveDigit(rowCounts, r1, r2, v1) + MoveDigit(rowCounts, r2, r1, v2)
+    delta += MoveDigit(colCounts, c1, c2, v1) + MoveDigit(colCounts, c2, c1, v2)
+    return delta
+
+
+def ProposedState(board, rowCounts, colCounts, freeBlocks):
+    boxesToFlip = TwoRandomBoxesWithinBlock(random.choice(freeBlocks))
+    costDifference = FlipBoxes(board, rowCounts, colCounts, boxesToFlip)
+    return boxesToFlip, costDifference
+
+
+def ChooseNewState(board, rowCounts, colCounts, freeBlocks, sigma):
+    # returns the accepted change in cost (0 when the swap was undone)
+    boxesToFlip, costDifference = ProposedState(board, rowCounts, colCounts, freeBlocks)
+    if costDifference <= 0 or random.random() < math.exp(-costDifference / sigma):
+        return costDifference
+    FlipBoxes(board, rowCounts, colCounts, boxesToFlip)
+    return 0
+
+
+def ChooseNumberOfItterations(fixed_sudoku):
+    numberOfItterations = 0
+    for i in range(0, 9):
+        for j in range(0, 9):
+            if fixed_sudoku[i, j] != 0:
+                numberOfItterations += 1
+    return numberOfItterations
+
+
+def CalculateInitialSigma(board, freeBlocks):
+    board = [row[:] for row in board]
+    rowCounts, colCounts = CountTables(board)
+    score = ErrorsFromCounts(rowCounts, colCounts)
+    listOfDifferences = []
+    for i in range(1, 10):
+        score += ProposedState(board, rowCounts, colCounts, freeBlocks)[1]
+        listOfDifferences.append(score)
+    return max(statistics.pstdev(listOfDifferences), 0.1)
+
+
+# Score tracing
+"""
+Opt-in trace of the score while annealing. `target` is a file path
+(appended to), an open file, or a callable that receives lists of
+scores. Only every `every`-th proposal is sampled, and samples are
+written in batches of `bufferSize`, so the hot loop never does I/O.
+"""
+class ScoreTrace:
+    def __init__(self, target, every=100, bufferSize=4096):
+        self.target = target
+        self.every = max(1, every)
+        self.bufferSize = bufferSize
+        self.buffer = []
+        self.file = None
+        self.countdown = self.every
+
+    def record(self, score):
+        self.countdown -= 1
+        if self.countdown:
+            return
+        self.countdown = self.every
+        self.buffer.append(score)
+        if len(self.buffer) >= self.bufferSize:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if callable(self.target):
+            self.target(self.buffer)
+        else:
+            if self.file is None:
+                self.file = open(self.target, "a") if isinstance(self.target, str) else self.target
+            self.file.write(''.join(str(score) + '\n' for score in self.buffer))
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.file is not None and isinstance(self.target, str):
+            self.file.close()
+        self.file = None
+
+
+# With stats: iterations as nodes, reheats as restarts, best_score, a
+# "stage" callback event after every temperature stage and "anneal" timing.
+# With a budget: one node per proposal; when it runs out the best board
+# seen so far is returned.
+def solveSudoku(sudoku, stats=None, trace=None, traceEvery=100, verbose=False, budget=None):
+    fixedSudoku = FixSudokuValues(np.copy(sudoku))
+    listOfBlocks = CreateList3x3Blocks()
+    freeBlocks = FreeBoxesPerBlock(fixedSudoku, listOfBlocks)
+    itterations = max(1, ChooseNumberOfItterations(fixedSudoku))
+    timer = phase(stats, 'anneal')
+    tracer = ScoreTrace(trace, traceEvery) if trace is not None else None
+    if verbose:
+        PrintSudoku(sudoku)
+
+    solutionFound = 0
+    bestBoard, bestScore = None, float('inf')
+    with timer:
+        try:
+            while (solutionFound == 0):
+                decreaseFactor = 0.99
+                stuckCount = 0
+                board = RandomlyFill3x3Blocks(np.copy(sudoku), listOfBlocks).tolist()
+                rowCounts, colCounts = CountTables(board)
+                score = ErrorsFromCounts(rowCounts, colCounts)
+                if score <= 0 or not freeBlocks:
+                    break
+                if budget is not None and score < bestScore:
+                    bestBoard, bestScore = [row[:] for row in board], score
+                sigma = CalculateInitialSigma(board, freeBlocks)
+
+                while solutionFound == 0:
+                    previousScore = score
+                    for i in range(0, itterations):
+                        if stats is not None:
+                            stats.nodes += 1
+                        if budget is not None and not budget.spend():
+                            break
+                        score += ChooseNewState(board, rowCounts, colCounts, freeBlocks, sigma)
+                        if budget is not None and score < bestScore:
+                            bestBoard, bestScore = [row[:] for row in board], score
+                        if tracer is not None:
+                            tracer.record(score)
+                        if score <= 0:
+                            solutionFound = 1
+                            break
+                    if budget is not None and budget.exhausted:
+                        break
+
+                    sigma = max(sigma * decreaseFactor, 0.01)
+                    if stats is not None:
+                        stats.score(score)
+                        if stats.callbacks:
+                            stats.emit('stage', score=score, sigma=sigma)
+                    if score <= 0:
+                        solutionFound = 1
+                        break
+                    if score >= previousScore:
+                        stuckCount += 1
+                    else:
+                        stuckCount = 0
+                    if (stuckCount > 80):
+                        sigma += 2
+                        if stats is not None:
+                            stats.restarts += 1
+                            if stats.callbacks:
+                                stats.emit('reheat', score=score, sigma=sigma)
+                if budget is not None and budget.exhausted:
+                    board = bestBoard
+                    break
+        finally:
+            if tracer is not None:
+                tracer.close()
+
+    tmpSudoku = np.array(board)
+    if verbose:
+        PrintSudoku(tmpSudoku)
+    return (tmpSudoku)
+
+
+if __name__ == "__main__":
+    startingSudoku = """
+                        530070000
+                        600195000
+                        098000060
+                        800060003
+                        400803001
+                        700020006
+                        060000280
+                        000419005
+                        000080079
+                    """
+
+    sudoku = np.array([[int(i) for i in line] for line in startingSudoku.split()])
+
+    solution = solveSudoku(sudoku, trace="demofile2.txt", verbose=True)
+    print(CalculateNumberOfErrors(solution))
+    PrintSudoku(solution)
@@ -0,0 +1,202 @@
+import heapq
+
+# -----------------------------
+# packed states
+# -----------------------------
+# A state is the board flattened row by row into 81 bytes (0 = empty).
+# This is far smaller than a list of lists, which keeps the open list of
+# A* compact.
+def pack(board):
+    return bytes(v for row in board for v in row)
+
+def unpack(state):
+    return [list(state[r * 9:(r + 1) * 9]) for r in range(9)]
+
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+FULL = 0b1111111110  # bit d set for digits 1..9
+POPCOUNT = [bin(m).count('1') for m in range(FULL + 1)]
+
+# -----------------------------
+# heuristic function
+# -----------------------------
+def heuristic(state):
+    # number of empty cells
+    return state.count(0)
+
+# -----------------------------
+# used digits per row / column / box
+# -----------------------------
+# Returns None if the givens already clash.
+def used_masks(state):
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    for i, v in enumerate(state):
+        if v:
+            bit = 1 << v
+            r, c, b = ROW_OF[i], COL_OF[i], BOX_OF[i]
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                return None
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+    return rows, cols, boxes
+
+# -----------------------------
+# most constrained empty cell
+# -----------------------------
+# Returns (cell, candidate mask); the mask is 0 when some empty cell has
+# no candidates left, i.e. the state is a dead end.
+def select_cell(state, rows, cols, boxes):
+    best, best_free, fewest = None, 0, 10
+    for i, v in enumerate(state):
+        if v == 0:
+            free = FULL & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+            n = POPCOUNT[free]
+            if n < fewest:
+                best, best_free, fewest = i, free, n
+                if n <= 1:
+                    break
+    return best, best_free
+
+def digits_of(mask):
+    return [d for d in range(1, 10) if mask >> d & 1]
+
+# -----------------------------
+# A* sudoku solver
+# -----------------------------
+"""
+g is the number of cells filled so far and h the number still empty, so
+f = g + h is the same for every state. Ties are broken on h and then on
+recency, which makes the search dive towards complete boards instead of
+sweeping level by level. Every popped state expands only its most
+constrained cell, chosen deterministically, so the states form a tree:
+a state's filled cells fix the path that led to it, no state can be
+generated twice, and no table of seen states is needed. A budget, if
+given, is charged one node per popped state and raises BudgetExhausted
+when it runs out.
+"""
+def a_star_sudoku(start_board, stats=None, budget=None):
+    start = pack(start_board)
+    if used_masks(start) is None:
+        return None
+
+    h = heuristic(start)
+    pq = [(h, h, 0, start)]
+    counter = 0
+    start_h = h
+
+    while pq:
+        if stats is not None and len(pq) > stats.max_frontier:
+            stats.max_frontier = len(pq)
+        f, h, _, state = heapq.heappop(pq)
+        if stats is not None:
+            stats.nodes += 1
+            if start_h - h > stats.max_depth:
+                stats.max_depth = start_h - h
+        if budget is not None:
+            budget.charge()
+
+        if h == 0:
+            return unpack(state)  # solved
+
+        rows, cols, boxes = used_masks(state)
+        cell, free = select_cell(state, rows, cols, boxes)
+        if not free:
+            continue  # dead end
+
+        child = bytearray(state)
+        for num in digits_of(free):
+            child[cell] = num
+            counter += 1
+            heapq.heappush(pq, (f, h - 1, -counter, bytes(child)))
+
+    return None
+
+# -----------------------------
+# IDA* sudoku solver
+# -----------------------------
+"""
+With g the cells filled and h the cells still empty, f = g + h is the
+same at every node, so the first f-bound already covers the whole tree
+and IDA* never deepens: it is a plain depth-first search. That is what
+this runs, without the bound. Only one board and its row/column/box
+masks are kept and assignments are undone on the way back, so memory
+grows with search depth rather than with the number of states visited.
+The budget works as in A*.
+"""
+def ida_star_sudoku(start_board, stats=None, budget=None):
+    state = bytearray(pack(start_board))
+    masks = used_masks(state)
+    if masks is None:
+        return None
+    rows, cols, boxes = masks
+
+    def search(g, h):
+        if h == 0:
+            return True
+        if stats is not None:
+            stats.nodes += 1
+            if g > stats.max_depth:
+                stats.max_depth = g
+        if budget is not None:
+            budget.charge()
+
+        cell, free = select_cell(state, rows, cols, boxes)
+        r, c, b = ROW_OF[cell], COL_OF[cell], BOX_OF[cell]
+        for num in digits_of(free):
+            bit = 1 << num
+            state[cell] = num
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+
+            if search(g + 1, h - 1):
+                return True
+
+            state[cell] = 0
+            rows[r] &= ~bit
+            cols[c] &= ~bit
+            boxes[b] &= ~bit
+            if stats is not None:
+                stats.backtracks += 1
+        return False
+
+    if search(0, heuristic(state)):
+        return unpack(state)
+    return None
+
+# -----------------------------
+# print sudoku board
+# -----------------------------
+def print_board(board):
+    for i in range(9):
+        for j in range(9):
+            print(board[i][j], end=" ")
+        print()
+
+# -----------------------------
+# main
+# -----------------------------
+if __name__ == "__main__":
+    board = [
+        [5,3,0,0,7,0,0,0,0],
+        [6,0,0,1,9,5,0,0,0],
+        [0,9,8,0,0,0,0,6,0],
+        [8,0,0,0,6,0,0,0,3],
+        [4,0,0,8,0,3,0,0,1],
+        [7,0,0,0,2,0,0,0,6],
+        [0,6,0,0,0,0,2,8,0],
+        [0,0,0,4,1,9,0,0,5],
+        [0,0,0,0,8,0,0,7,9]
+    ]
+
+    solution = a_star_sudoku(board)
+
+    if solution:
+        print("Solved Sudoku:\n")
+        print_board(solution)
+    else:
+        print("No solution found.")
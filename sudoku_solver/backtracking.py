@@ -0,0 +1,119 @@
+from math import isqrt
+
+from .grid import popcounts
+
+# Function to solve the Sudoku problem
+"""
+mat is a 9x9, 16x16 or 25x25 list of lists (0 for empty cells), solved in
+place; returns True, or False when there is no solution (mat unchanged).
+
+The empty cells are listed once, and the digits used in every row, column
+and box are kept as bitmasks (bit d-1 for digit d), so the candidates of a
+cell cost one OR instead of rescanning 27 cells. Each step fills the open
+cell with the fewest candidates: empty[:depth] holds the filled cells and
+the chosen cell is swapped to empty[depth]. The search runs on an explicit
+stack, tried[depth] holding the candidates still to try at that depth, so
+deep boards never touch the recursion limit and a step allocates nothing.
+
+With stats, each placement is a node and each undone one a backtrack; a
+budget is charged one node per placement and raises BudgetExhausted when
+it runs out, leaving mat partly filled.
+"""
+def solveSudoku(mat, stats=None, budget=None):
+    size = len(mat)
+    box = isqrt(size)
+    full = (1 << size) - 1
+    popcount = popcounts(size)
+
+    rows = [0] * size
+    cols = [0] * size
+    boxes = [0] * size
+    empty = []
+    for r in range(size):
+        for c in range(size):
+            b = (r // box) * box + c // box
+            if mat[r][c] == 0:
+                empty.append((r, c, b))
+                continue
+            bit = 1 << (mat[r][c] - 1)
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                return False  # the givens already clash
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+
+    count = len(empty)
+    tried = [0] * count
+    placed = [0] * count
+    depth = 0
+    candidates = None
+
+    while True:
+        if candidates is None:
+            if depth == count:
+                return True
+
+            # Pick the open cell with the fewest candidates
+            best, fewest = depth, size + 1
+            for i in range(depth, count):
+                r, c, b = empty[i]
+                free = full & ~(rows[r] | cols[c] | boxes[b])
+                n = popcount[free]
+                if n < fewest:
+                    best, fewest, candidates = i, n, free
+                    if n <= 1:
+                        break
+            empty[depth], empty[best] = empty[best], empty[depth]
+
+        if candidates:
+            # Place the lowest remaining candidate and go one level deeper
+            bit = candidates & -candidates
+            tried[depth] = candidates ^ bit
+            placed[depth] = bit
+            r, c, b = empty[depth]
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            mat[r][c] = bit.bit_length()
+            depth += 1
+            candidates = None
+            if stats is not None:
+                stats.nodes += 1
+                if depth > stats.max_depth:
+                    stats.max_depth = depth
+            if budget is not None:
+                budget.charge()
+            continue
+
+        # Dead end: undo the previous placement and try its next candidate
+        if depth == 0:
+            return False
+        depth -= 1
+        bit = placed[depth]
+        r, c, b = empty[depth]
+        rows[r] &= ~bit
+        cols[c] &= ~bit
+        boxes[b] &= ~bit
+        mat[r][c] = 0
+        candidates = tried[depth]
+        if stats is not None:
+            stats.backtracks += 1
+
+if __name__ == "__main__":
+    mat = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9]
+    ]
+
+    solveSudoku(mat)
+
+    for row in mat:
+
+        print(" ".join(map(str, row)))
@@ -0,0 +1,178 @@
+# Batch Sudoku Solver
+# Streams puzzles from a file, solves them on a process pool and writes the
+# solutions back in input order.
+
+import argparse
+import itertools
+import os
+import sys
+from collections import deque
+from multiprocessing import Pool
+
+from . import METHODS, NESTED, solve, to_board, to_string
+
+UNSOLVABLE = "unsolvable"
+ERROR = "error"  # written as "error: <reason>" for a malformed puzzle
+
+# -----------------------------
+# input formats
+# -----------------------------
+"""
+Two formats are accepted, and may be mixed in one file:
+
+  one puzzle per line, 81 characters, '.' or '0' for empty cells
+  (the format grid2values takes)
+
+  9 lines of 9 whitespace-separated digits, 0 for empty cells
+  (the format of "new 2.txt"), optionally separated by blank lines
+
+A line that fits neither format, or a grid cut short, is yielded as an
+"error: <reason>" line in place of a puzzle, so a bad line costs one
+output line instead of the whole run.
+"""
+def read_puzzles(lines):
+    rows = []
+    for number, line in enumerate(lines, 1):
+        tokens = line.split()
+        if not tokens:
+            continue
+        if len(tokens) == 1 and len(tokens[0]) == 81:
+            if rows:
+                yield "%s: line %d: grid ended after %d rows" % (ERROR, number, len(rows))
+                rows = []
+            yield tokens[0].replace('0', '.')
+        elif len(tokens) == 9:
+            rows.append(''.join(tokens))
+            if len(rows) == 9:
+                yield ''.join(rows).replace('0', '.')
+                rows = []
+        else:
+            yield "%s: line %d: unrecognised puzzle line %r" % (ERROR, number, line.strip()[:100])
+    if rows:
+        yield "%s: incomplete grid at end of input" % ERROR
+
+
+def chunked(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+# -----------------------------
+# worker side
+# -----------------------------
+# method "vectorized" propagates the whole chunk at once (see vectorized.py).
+# A malformed puzzle gets an ERROR line instead of failing the chunk, and
+# ERROR lines from read_puzzles are passed through.
+def solve_chunk(chunk, method='csp'):
+    if method == 'vectorized':
+        return _solve_vectorized(chunk)
+    results = []
+    for puzzle in chunk:
+        if puzzle.startswith(ERROR):
+            results.append(puzzle)
+            continue
+        try:
+            board = to_board(puzzle)
+        except ValueError as exc:
+            results.append('%s: %s' % (ERROR, exc))
+            continue
+        board = solve(board, method)
+        results.append(to_string(board) if board else UNSOLVABLE)
+    return results
+
+
+def _solve_vectorized(chunk):
+    from .dataset import format_cells, parse
+    from .vectorized import solve_batch
+    try:
+        cells = parse(chunk)
+        results = [None] * len(chunk)
+    except ValueError:
+        # find the bad puzzles and batch the rest
+        results, good = [], []
+        for puzzle in chunk:
+            if puzzle.startswith(ERROR):
+                results.append(puzzle)
+                continue
+            try:
+                to_board(puzzle)
+                parse([puzzle])
+            except ValueError as exc:
+                results.append('%s: %s' % (ERROR, exc))
+            else:
+                results.append(None)
+                good.append(puzzle)
+        cells = parse(good)
+    answers = iter([])
+    if len(cells):
+        solved_cells, solved = solve_batch(cells)
+        answers = (s if ok else UNSOLVABLE for s, ok in zip(format_cells(solved_cells), solved))
+    return [r if r is not None else next(answers) for r in results]
+
+# -----------------------------
+# batch driver
+# -----------------------------
+"""
+At most `processes * max_pending` chunks are in flight at a time, so
+memory stays flat however large the input is. Results are collected in
+submission order, which keeps the output aligned with the input.
+"""
+def solve_stream(puzzles, processes=None, chunk_size=1000, max_pending=2, method='csp'):
+    if method != 'vectorized' and method not in METHODS:
+        raise ValueError("unknown method %r (choose from %s)"
+                         % (method, ', '.join(sorted(METHODS) + ['vectorized'])))
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for chunk in chunked(puzzles, chunk_size):
+            yield from solve_chunk(chunk, method)
+        return
+
+    if method in NESTED:
+        raise ValueError("method %r runs its own processes and cannot run on a pool" % method)
+    limit = processes * max_pending
+    with Pool(processes) as pool:
+        pending = deque()
+        for chunk in chunked(puzzles, chunk_size):
+            pending.append(pool.apply_async(solve_chunk, (chunk, method)))
+            if len(pending) >= limit:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+# input_path may also be a packed file (see dataset.py)
+def solve_file(input_path, output_path, processes=None, chunk_size=1000, method='csp'):
+    from .dataset import PackedPuzzles, is_packed
+    count = 0
+    packed = is_packed(input_path)
+    with (PackedPuzzles(input_path) if packed else open(input_path, 'r')) as src, \
+            open(output_path, 'w') as dst:
+        puzzles = iter(src) if packed else read_puzzles(src)
+        for solution in solve_stream(puzzles, processes, chunk_size, method=method):
+            dst.write(solution + '\n')
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of Sudoku puzzles in parallel.")
+    parser.add_argument("input", help="puzzle file (81-character lines, 9x9 grids or a packed file)")
+    parser.add_argument("output", help="file to write one 81-character solution per line")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=1000,
+                        help="puzzles sent to a worker at a time")
+    parser.add_argument("-m", "--method", default="csp", choices=sorted(METHODS) + ['vectorized'],
+                        help="solver to use, or 'vectorized' for batched propagation (default: csp)")
+    args = parser.parse_args(argv)
+
+    count = solve_file(args.input, args.output, args.processes, args.chunk_size,
+                       args.method)
+    print("solved %d puzzles" % count, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
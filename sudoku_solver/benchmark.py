@@ -0,0 +1,245 @@
+# Cross-solver benchmark
+# Runs every solver over a tiered puzzle corpus, one puzzle per child
+# process so that a per-puzzle timeout can always be enforced, and writes
+# the results as JSON. A saved run can be used as a baseline to flag
+# slowdowns.
+#
+#   python -m sudoku_solver.benchmark -o results.json
+#   python -m sudoku_solver.benchmark --baseline results.json
+
+import argparse
+import contextlib
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from . import METHOD_MODULES, METHODS, NESTED, is_solution, solve
+from .stats import SearchStats
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'corpus.txt')
+TIERS = ('easy', 'medium', 'hard', 'hardest')
+
+# -----------------------------
+# corpus
+# -----------------------------
+# One "<tier> <81-character puzzle>" per line; '#' starts a comment.
+def load_corpus(path=CORPUS, tiers=None):
+    corpus = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            tier, puzzle = line.split()
+            if tiers is None or tier in tiers:
+                corpus.append((tier, puzzle))
+    return corpus
+
+# -----------------------------
+# one measured run (child process)
+# -----------------------------
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _run(conn, puzzle, method):
+    # import the solver module before the clock starts
+    importlib.import_module('.' + METHOD_MODULES[method], __package__)
+    stats = SearchStats()
+    rss_before = _peak_rss_kb()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        try:
+            board = solve(puzzle, method, stats)
+            error = None
+        except Exception as exc:
+            board, error = None, '%s: %s' % (type(exc).__name__, exc)
+        wall = time.perf_counter() - start
+    rss_after = _peak_rss_kb()
+
+    conn.send(dict(
+        stats.as_dict(),
+        status='error' if error else ('solved' if board and is_solution(board, puzzle) else 'failed'),
+        error=error,
+        wall_time=wall,
+        peak_memory_kb=None if rss_before is None else rss_after - rss_before,
+    ))
+    conn.close()
+
+
+"""
+Runs a single solve in a fresh process. A run that does not finish in
+`timeout` seconds is killed and reported with status "timeout".
+"""
+def run_one(puzzle, method, timeout):
+    if method in NESTED:
+        raise ValueError("method %r runs its own processes and cannot be benchmarked" % method)
+    ctx = multiprocessing.get_context()
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run, args=(send, puzzle, method), daemon=True)
+    start = time.perf_counter()
+    proc.start()
+    send.close()
+
+    if recv.poll(timeout):
+        try:
+            result = recv.recv()
+        except EOFError:
+            result = None
+    else:
+        result = {'status': 'timeout', 'wall_time': time.perf_counter() - start}
+    proc.terminate()
+    proc.join()
+    recv.close()
+
+    if result is None:
+        result = {'status': 'error', 'error': 'worker exited with code %s' % proc.exitcode,
+                  'wall_time': time.perf_counter() - start}
+    return result
+
+# -----------------------------
+# full benchmark
+# -----------------------------
+def summarize(records):
+    groups = {}
+    for rec in records:
+        groups.setdefault((rec['method'], rec['tier']), []).append(rec)
+
+    summary = {}
+    for (method, tier), recs in sorted(groups.items()):
+        solved = [r for r in recs if r['status'] == 'solved']
+        times = [r['wall_time'] for r in solved]
+        memory = [r['peak_memory_kb'] for r in recs if r.get('peak_memory_kb') is not None]
+        summary['%s/%s' % (method, tier)] = {
+            'method': method,
+            'tier': tier,
+            'runs': len(recs),
+            'solved': len(solved),
+            'timeouts': sum(r['status'] == 'timeout' for r in recs),
+            'success_rate': len(solved) / len(recs),
+            'median_wall_time': statistics.median(times) if times else None,
+            'mean_wall_time': statistics.mean(times) if times else None,
+            'total_nodes': sum(r.get('nodes', 0) for r in solved),
+            'total_backtracks': sum(r.get('backtracks', 0) for r in solved),
+            'max_peak_memory_kb': max(memory) if memory else None,
+        }
+    return summary
+
+
+def run_benchmark(methods=None, tiers=None, timeout=10.0, corpus=CORPUS, progress=None):
+    methods = list(methods or (m for m in METHODS if m not in NESTED))
+    puzzles = load_corpus(corpus, tiers)
+    records = []
+    for method in methods:
+        for index, (tier, puzzle) in enumerate(puzzles):
+            result = run_one(puzzle, method, timeout)
+            result.update(method=method, tier=tier, puzzle=puzzle, index=index)
+            records.append(result)
+            if progress:
+                progress(result)
+
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timeout': timeout,
+            'methods': methods,
+            'corpus': os.path.basename(corpus),
+        },
+        'summary': summarize(records),
+        'runs': records,
+    }
+
+# -----------------------------
+# regression gate
+# -----------------------------
+"""
+Compares two benchmark results group by group (method/tier). A group
+regresses when its median solve time grows by more than `threshold`
+(1.25 → 25% slower) or when it solves fewer puzzles than the baseline.
+Groups missing from either run are ignored.
+"""
+def compare(current, baseline, threshold=1.25):
+    regressions = []
+    for key, base in baseline['summary'].items():
+        cur = current['summary'].get(key)
+        if cur is None:
+            continue
+        if cur['success_rate'] < base['success_rate']:
+            regressions.append({'group': key, 'metric': 'success_rate',
+                                'baseline': base['success_rate'], 'current': cur['success_rate']})
+        if base['median_wall_time'] and cur['median_wall_time']:
+            ratio = cur['median_wall_time'] / base['median_wall_time']
+            if ratio > threshold:
+                regressions.append({'group': key, 'metric': 'median_wall_time',
+                                    'baseline': base['median_wall_time'],
+                                    'current': cur['median_wall_time'], 'ratio': ratio})
+    return regressions
+
+
+def print_summary(summary, out=sys.stdout):
+    header = '%-28s %7s %9s %12s %12s %12s %10s' % (
+        'method/tier', 'solved', 'timeouts', 'median ms', 'nodes', 'backtracks', 'peak KB')
+    print(header, file=out)
+    print('-' * len(header), file=out)
+    for key, s in summary.items():
+        median = '-' if s['median_wall_time'] is None else '%.2f' % (s['median_wall_time'] * 1000)
+        peak = '-' if s['max_peak_memory_kb'] is None else str(s['max_peak_memory_kb'])
+        print('%-28s %3d/%-3d %9d %12s %12d %12d %10s' % (
+            key, s['solved'], s['runs'], s['timeouts'], median,
+            s['total_nodes'], s['total_backtracks'], peak), file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Sudoku solvers.")
+    parser.add_argument('-m', '--methods', nargs='+', choices=sorted(set(METHODS) - NESTED),
+                        help="solvers to run (default: all)")
+    parser.add_argument('-t', '--tiers', nargs='+', choices=TIERS,
+                        help="corpus tiers to run (default: all)")
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help="seconds allowed per puzzle (default: 10)")
+    parser.add_argument('--corpus', default=CORPUS, help="corpus file")
+    parser.add_argument('-o', '--output', help="write the JSON results here")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="allowed median-time ratio against the baseline (default: 1.25)")
+    args = parser.parse_args(argv)
+
+    def progress(r):
+        print('%-16s %-8s #%-3d %-8s %8.1f ms' % (
+            r['method'], r['tier'], r['index'], r['status'], r['wall_time'] * 1000), file=sys.stderr)
+
+    results = run_benchmark(args.methods, args.tiers, args.timeout, args.corpus, progress)
+    print_summary(results['summary'])
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print('REGRESSION %(group)s %(metric)s: %(baseline)s -> %(current)s' % r, file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
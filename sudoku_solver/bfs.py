@@ -0,0 +1,262 @@
+import mmap
+import os
+import sys
+import tempfile
+from collections import deque
+
+from .grid import PACKED_SIZE, pack_cells, unpack_cells
+
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+FULL = 0b1111111110  # bit d set for digits 1..9
+POPCOUNT = [bin(m).count('1') for m in range(FULL + 1)]
+
+# -----------------------------
+# frontier
+# -----------------------------
+"""
+FIFO queue of fixed-size records (41-byte packed boards).
+
+Records are kept in memory until `ram_budget` bytes are in use. After that,
+new records are appended to spill files in `spill_dir`, and the spill
+files are read back through mmap, one memory-sized batch at a time, once
+the in-memory part has been drained. Order is first-in first-out across
+memory and disk.
+"""
+class Frontier:
+    def __init__(self, ram_budget=256 * 1024 * 1024, record_size=PACKED_SIZE, spill_dir=None):
+        self.record_size = record_size
+        self.ram_budget = ram_budget
+        self.spill_dir = spill_dir
+        # bytes object plus the deque slot that points at it
+        self.record_overhead = sys.getsizeof(bytes(record_size)) + 8
+
+        self._memory = deque()
+        self._spilled = deque()      # closed spill files: (path, records)
+        self._writer = None          # (file, path, records) being appended to
+        self._reader = None          # (mmap, file, path, offset, end) being drained
+
+        self.size = 0
+        self.spilled_records = 0
+        self.spill_files = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, record):
+        self.size += 1
+        if (self._writer is None and self._reader is None and not self._spilled
+                and len(self._memory) * self.record_overhead < self.ram_budget):
+            self._memory.append(record)
+            return
+
+        if self._writer is None:
+            fd, path = tempfile.mkstemp(prefix='bfs-frontier-', suffix='.bin', dir=self.spill_dir)
+            self._writer = [os.fdopen(fd, 'wb'), path, 0]
+            self.spill_files += 1
+        self._writer[0].write(record)
+        self._writer[2] += 1
+        self.spilled_records += 1
+
+    def pop(self):
+        if not self._memory:
+            self._refill()
+        self.size -= 1
+        return self._memory.popleft()
+
+    def _refill(self):
+        if self._reader is None:
+            if not self._spilled:
+                if self._writer is None:
+                    raise IndexError('pop from an empty frontier')
+                f, path, records = self._writer
+                f.close()
+                self._spilled.append((path, records))
+                self._writer = None
+            path, records = self._spilled.popleft()
+            f = open(path, 'rb')
+            self._reader = [mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), f, path, 0,
+                            records * self.record_size]
+
+        view, f, path, offset, end = self._reader
+        batch = max(1, self.ram_budget // self.record_overhead) * self.record_size
+        stop = min(end, offset + batch)
+        size = self.record_size
+        self._memory.extend(view[i:i + size] for i in range(offset, stop, size))
+        self._reader[3] = stop
+        if stop >= end:
+            view.close()
+            f.close()
+            os.remove(path)
+            self._reader = None
+
+    def bytes_per_state(self):
+        if not self.size:
+            return 0
+        in_memory = len(self._memory)
+        on_disk = self.size - in_memory
+        return (in_memory * self.record_overhead + on_disk * self.record_size) / self.size
+
+    def memory_bytes(self):
+        return len(self._memory) * self.record_overhead
+
+    def close(self):
+        if self._reader is not None:
+            view, f, path = self._reader[:3]
+            view.close()
+            f.close()
+            os.remove(path)
+            self._reader = None
+        if self._writer is not None:
+            self._writer[0].close()
+            self._spilled.append((self._writer[1], self._writer[2]))
+            self._writer = None
+        while self._spilled:
+            os.remove(self._spilled.popleft()[0])
+        self._memory.clear()
+        self.size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# -----------------------------
+# expansion
+# -----------------------------
+# Returns the most constrained empty cell and its candidate mask, or
+# (None, 0) for a complete board. A mask of 0 means a dead end.
+def select_cell(cells):
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    for i, v in enumerate(cells):
+        if v:
+            bit = 1 << v
+            rows[ROW_OF[i]] |= bit
+            cols[COL_OF[i]] |= bit
+            boxes[BOX_OF[i]] |= bit
+
+    best, best_free, fewest = None, 0, 10
+    for i, v in enumerate(cells):
+        if v == 0:
+            free = FULL & ~(rows[ROW_OF[i]] | cols[COL_OF[i]] | boxes[BOX_OF[i]])
+            n = POPCOUNT[free]
+            if n < fewest:
+                best, best_free, fewest = i, free, n
+                if n == 0:
+                    break
+    return best, best_free
+
+def is_consistent(cells):
+    for group in (ROW_OF, COL_OF, BOX_OF):
+        seen = set()
+        for i, v in enumerate(cells):
+            if v:
+                key = (group[i], v)
+                if key in seen:
+                    return False
+                seen.add(key)
+    return True
+
+# -----------------------------
+# BFS
+# -----------------------------
+"""
+Yields every solution of `board` in breadth-first order, stopping after
+`limit` solutions when a limit is given.
+
+Every state expands only its most constrained empty cell, chosen
+deterministically, so the states form a tree: two branches split on the
+digit of one cell and never meet again. No state is generated twice and
+there is no duplicate filter; the whole `ram_budget` goes to the
+frontier, which spills to `spill_dir` past it. `progress` is called
+every `report_every` expansions with a dict of frontier size, memory in
+use, bytes per state and spill counts. `budget` (a search
+budget, unlike ram_budget) is charged one node per expansion and raises
+BudgetExhausted when it runs out.
+"""
+def bfs_all_solutions(board, limit=None, stats=None, ram_budget=256 * 1024 * 1024,
+                      spill_dir=None, progress=None, report_every=100000, budget=None):
+    cells = [v for row in board for v in row]
+    if not is_consistent(cells):
+        return
+
+    found = 0
+    expanded = 0
+    level = None
+    start_filled = 81 - cells.count(0)
+    with Frontier(ram_budget, spill_dir=spill_dir) as frontier:
+        frontier.push(pack_cells(cells))
+
+        while frontier:
+            state = frontier.pop()
+            cells = unpack_cells(state)
+            expanded += 1
+            if stats is not None:
+                stats.nodes += 1
+                if len(frontier) + 1 > stats.max_frontier:
+                    stats.max_frontier = len(frontier) + 1
+            if budget is not None:
+                budget.charge()
+
+            cell, free = select_cell(cells)
+            if cell is None:
+                yield [cells[r * 9:(r + 1) * 9] for r in range(9)]  # Solution found
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+                continue
+
+            filled = 81 - cells.count(0)
+            if filled != level:
+                level = filled
+                if stats is not None:
+                    stats.max_depth = max(stats.max_depth, level - start_filled)
+
+            for num in range(1, 10):
+                if free >> num & 1:
+                    cells[cell] = num
+                    frontier.push(pack_cells(cells))
+
+            if progress is not None and expanded % report_every == 0:
+                progress({
+                    'expanded': expanded,
+                    'frontier': len(frontier),
+                    'memory_bytes': frontier.memory_bytes(),
+                    'bytes_per_state': frontier.bytes_per_state(),
+                    'spilled_states': frontier.spilled_records,
+                    'spill_files': frontier.spill_files,
+                    'level': level,
+                    'solutions': found,
+                })
+
+def bfs_sudoku_solver(board, stats=None, ram_budget=256 * 1024 * 1024, spill_dir=None, progress=None,
+                      budget=None):
+    for solution in bfs_all_solutions(board, 1, stats, ram_budget, spill_dir, progress,
+                                      budget=budget):
+        return solution
+    return None
+
+if __name__ == "__main__":
+    # Sudoku input from the image
+    initial_board = [
+        [5,3,0,0,7,0,0,0,0],
+        [6,0,0,1,9,5,0,0,0],
+        [0,9,8,0,0,0,0,6,0],
+        [8,0,0,0,6,0,0,0,3],
+        [4,0,0,8,0,3,0,0,1],
+        [7,0,0,0,2,0,0,0,6],
+        [0,6,0,0,0,0,2,8,0],
+        [0,0,0,4,1,9,0,0,5],
+        [0,0,0,0,8,0,0,7,9]
+    ]
+
+    # Solve the Sudoku
+    solution = bfs_sudoku_solver(initial_board)
+
+    # Print solution
+    for row in solution:
+        print(row)
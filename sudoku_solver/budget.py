@@ -0,0 +1,84 @@
+# Search budgets
+# Every solver takes an optional `budget` that bounds its wall-clock time
+# and/or its node count (the same units it counts into SearchStats.nodes).
+# Passing budget=None (the default) leaves a solver unbounded.
+
+import time
+
+class BudgetExhausted(Exception):
+    """Raised inside the exact searches to unwind them when the budget runs out."""
+
+    def __init__(self, reason):
+        super().__init__("%s budget exhausted" % reason)
+        self.reason = reason
+
+
+class Budget:
+    """
+    seconds → wall-clock allowance, counted from when the Budget is made
+    nodes   → node allowance
+
+    Local searches call spend() once per iteration and stop when it
+    returns False; exact searches call charge(), which raises
+    BudgetExhausted instead. A Budget is meant for a single solve.
+    """
+    __slots__ = ('seconds', 'nodes', 'used', 'deadline', 'reason')
+
+    def __init__(self, seconds=None, nodes=None):
+        self.seconds = seconds
+        self.nodes = nodes
+        self.used = 0
+        self.deadline = None if seconds is None else time.perf_counter() + seconds
+        self.reason = None
+
+    def spend(self, n=1):
+        self.used += n
+        if self.nodes is not None and self.used > self.nodes:
+            self.reason = 'nodes'
+        elif self.deadline is not None and time.perf_counter() > self.deadline:
+            self.reason = 'time'
+        return self.reason is None
+
+    def charge(self, n=1):
+        if not self.spend(n):
+            raise BudgetExhausted(self.reason)
+
+    @property
+    def exhausted(self):
+        return self.reason is not None
+
+    def remaining_seconds(self):
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def remaining_nodes(self):
+        if self.nodes is None:
+            return None
+        return max(0, self.nodes - self.used)
+
+    def __repr__(self):
+        return 'Budget(seconds=%r, nodes=%r, used=%d)' % (self.seconds, self.nodes, self.used)
+
+
+class Exhausted:
+    """
+    What solve() returns when the budget runs out before an answer. It is
+    falsy, so `if board:` checks keep working.
+
+    reason    → "time" or "nodes"
+    grid      → best grid found so far (local searches), else None
+    conflicts → clashes left in that grid, else None
+    """
+    __slots__ = ('reason', 'grid', 'conflicts')
+
+    def __init__(self, reason, grid=None, conflicts=None):
+        self.reason = reason
+        self.grid = grid
+        self.conflicts = conflicts
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return 'Exhausted(reason=%r, conflicts=%r)' % (self.reason, self.conflicts)
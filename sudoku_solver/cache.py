@@ -0,0 +1,383 @@
+# Solution cache
+# Puzzles that differ only by a Sudoku symmetry share one cache entry: each
+# puzzle is brought into a canonical form, the canonical solution is looked
+# up in an in-memory LRU backed by an optional memory-mapped file, and a
+# hit is mapped back through the inverse transform.
+#
+#   with SolutionCache(path='solutions.cache') as cache:
+#       board = cache.solve(puzzle, 'dlx')
+#       print(cache.cache_info())
+
+import itertools
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections import OrderedDict
+from math import factorial
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+from . import solve
+from .grid import PACKED_SIZE, is_solution, pack_cells, to_board, unpack_cells
+
+# -----------------------------
+# canonical form
+# -----------------------------
+"""
+The symmetry group is generated by transposition, band and stack swaps,
+row swaps inside a band, column swaps inside a stack and digit
+relabelling. The canonical form is the smallest puzzle in the orbit,
+compared first by its pattern of empty cells (row by row, empties first)
+and then by its digits, relabelled in order of first appearance.
+
+The pattern is minimised one row at a time. Columns are kept as an
+ordered partition that each placed row refines, so the 1296 column
+orders are never enumerated; only ties between rows are branched on.
+Orderings the pattern cannot tell apart are then tried in full for the
+digits. Highly symmetric patterns (nearly full grids) tie almost
+everywhere; past MAX_STATES / MAX_CANDIDATES the puzzle is used as its
+own key and only exact repeats hit.
+"""
+MAX_STATES = 64
+MAX_CANDIDATES = 512
+
+
+def _refine(blocks, filled):
+    # blocks: stacks that may still swap, grouped; a stack is a list of
+    # column tuples whose order is still free
+    value = []
+    refined = []
+    for block in blocks:
+        keyed = []
+        for stack in block:
+            pattern = []
+            parts = []
+            for cols in stack:
+                empty = tuple(c for c in cols if not filled[c])
+                full = tuple(c for c in cols if filled[c])
+                for part, flag in ((empty, 0), (full, 1)):
+                    if part:
+                        parts.append(part)
+                        pattern.extend([flag] * len(part))
+            keyed.append((pattern, parts))
+        keyed.sort(key=lambda item: item[0])
+        for pattern, group in itertools.groupby(keyed, key=lambda item: item[0]):
+            group = [parts for _, parts in group]
+            value.extend(pattern * len(group))
+            refined.append(group)
+    return value, refined
+
+
+def _column_orders(blocks):
+    per_block = []
+    for block in blocks:
+        options = []
+        for stacks in itertools.permutations(block):
+            parts = [itertools.permutations(cols) for stack in stacks for cols in stack]
+            for choice in itertools.product(*parts):
+                options.append(sum(choice, ()))
+        per_block.append(options)
+    for choice in itertools.product(*per_block):
+        yield sum(choice, ())
+
+
+def _orderings(blocks):
+    count = 1
+    for block in blocks:
+        count *= factorial(len(block))
+        for stack in block:
+            for cols in stack:
+                count *= factorial(len(cols))
+    return count
+
+
+"""
+cells is a list of 81 ints (0 for empty). Returns (canonical, transform)
+where canonical is the transformed list of 81 ints and transform is
+(transposed, row order, column order, digit map), or None when the
+puzzle is too symmetric to canonicalise cheaply.
+"""
+def canonical_form(cells):
+    grids = (cells, [cells[c * 9 + r] for r in range(9) for c in range(9)])
+    states = []
+    for t, grid in enumerate(grids):
+        filled = [[grid[r * 9 + c] != 0 for c in range(9)] for r in range(9)]
+        states.append((t, filled, (), [[[(0, 1, 2)], [(3, 4, 5)], [(6, 7, 8)]]]))
+
+    # empty-cell pattern, one row at a time
+    for step in range(9):
+        best, ties = None, []
+        for t, filled, rows, blocks in states:
+            if step % 3:
+                band = rows[-1] // 3
+                choices = [r for r in range(band * 3, band * 3 + 3) if r not in rows]
+            else:
+                used = {r // 3 for r in rows}
+                choices = [r for r in range(9) if r // 3 not in used]
+            for r in choices:
+                value, refined = _refine(blocks, filled[r])
+                if best is None or value < best:
+                    best, ties = value, []
+                if value == best:
+                    ties.append((t, filled, rows + (r,), refined))
+        states = ties
+        if len(states) > MAX_STATES:
+            return None
+
+    if sum(_orderings(blocks) for _, _, _, blocks in states) > MAX_CANDIDATES:
+        return None
+
+    # digits, over every ordering the pattern left open
+    best = None
+    for t, _, rows, blocks in states:
+        grid = grids[t]
+        for cols in _column_orders(blocks):
+            labels = {}
+            out = []
+            for r in rows:
+                base = r * 9
+                for c in cols:
+                    v = grid[base + c]
+                    if v:
+                        v = labels.setdefault(v, len(labels) + 1)
+                    out.append(v)
+            if best is None or out < best[0]:
+                best = (out, (t, rows, cols, labels))
+
+    canonical, (t, rows, cols, labels) = best
+    for d in range(1, 10):
+        if d not in labels:
+            labels[d] = len(labels) + 1
+    return canonical, (t, rows, cols, labels)
+
+
+def apply_transform(cells, transform):
+    t, rows, cols, labels = transform
+    if t:
+        cells = [cells[c * 9 + r] for r in range(9) for c in range(9)]
+    return [labels[cells[r * 9 + c]] if cells[r * 9 + c] else 0 for r in rows for c in cols]
+
+
+def invert_transform(cells, transform):
+    t, rows, cols, labels = transform
+    digits = {label: d for d, label in labels.items()}
+    out = [0] * 81
+    for i, r in enumerate(rows):
+        for j, c in enumerate(cols):
+            v = cells[i * 9 + j]
+            out[r * 9 + c] = digits[v] if v else 0
+    if t:
+        out = [out[c * 9 + r] for r in range(9) for c in range(9)]
+    return out
+
+# -----------------------------
+# persistent store
+# -----------------------------
+"""
+A fixed-size hash table in a memory-mapped file, shared by every process
+that opens it. Each slot holds a used flag, the packed canonical puzzle,
+its packed solution (grid.pack_cells, 41 bytes each) and a CRC-32 of the
+two. Lookups probe PROBES slots from the key's home slot; when they are
+all taken a new entry overwrites the home slot, so the file never grows.
+
+Writers take an exclusive flock on the file and readers a shared one
+(where fcntl exists); a slot whose checksum does not match, torn by a
+writer without the lock or corrupted on disk, reads as a miss.
+"""
+class SolutionStore:
+    MAGIC = b'SDKC'
+    VERSION = 2
+    HEADER = struct.Struct('<4sII')
+    CHECKSUM = struct.Struct('<I')
+    SLOT = 1 + 2 * PACKED_SIZE + CHECKSUM.size
+    PROBES = 8
+
+    def __init__(self, path, capacity=1 << 16):
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, 'r+b' if exists else 'w+b')
+        if exists:
+            magic, version, capacity = self.HEADER.unpack(self.file.read(self.HEADER.size))
+            if magic != self.MAGIC or version != self.VERSION:
+                self.file.close()
+                raise ValueError("%s is not a solution store (or has an older format)" % path)
+        else:
+            self.file.write(self.HEADER.pack(self.MAGIC, self.VERSION, capacity))
+            self.file.truncate(self.HEADER.size + capacity * self.SLOT)
+        self.capacity = capacity
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def _lock(self, exclusive):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+
+    def _slots(self, key):
+        home = zlib.crc32(key) % self.capacity
+        for i in range(self.PROBES):
+            yield self.HEADER.size + ((home + i) % self.capacity) * self.SLOT
+
+    def get(self, key):
+        self._lock(False)
+        try:
+            for offset in self._slots(key):
+                slot = self.map[offset:offset + self.SLOT]
+                if not slot[0]:
+                    return None
+                if slot[1:1 + PACKED_SIZE] == key:
+                    entry = slot[1:1 + 2 * PACKED_SIZE]
+                    if self.CHECKSUM.unpack_from(slot, 1 + 2 * PACKED_SIZE)[0] != zlib.crc32(entry):
+                        return None
+                    return entry[PACKED_SIZE:]
+            return None
+        finally:
+            self._unlock()
+
+    def put(self, key, value):
+        self._lock(True)
+        try:
+            home = None
+            for offset in self._slots(key):
+                if home is None:
+                    home = offset
+                if not self.map[offset] or self.map[offset + 1:offset + 1 + PACKED_SIZE] == key:
+                    home = offset
+                    break
+            entry = key + value
+            self.map[home:home + self.SLOT] = b'\x01' + entry + self.CHECKSUM.pack(zlib.crc32(entry))
+        finally:
+            self._unlock()
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+# -----------------------------
+# cache in front of solve()
+# -----------------------------
+"""
+solve() has the same signature as sudoku_solver.solve; only 9x9 puzzles
+go through the cache. Entries are keyed by the canonical puzzle and hold
+its canonical solution, so every solver shares them. Every entry maps a
+packed puzzle to a solution of that exact puzzle, so the puzzle as given
+is also remembered in memory and looked up first, before paying for
+canonicalisation. Each hit is checked with is_solution() against the
+puzzle and counts as a miss if it fails. Failed solves are not cached
+(the local-search methods can fail on solvable puzzles).
+
+cache_info() reports hits (from memory or the store), misses, the hit
+rate and the mean time spent canonicalising and looking up.
+"""
+class SolutionCache:
+    def __init__(self, maxsize=100000, path=None, capacity=1 << 16):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.store = SolutionStore(path, capacity) if path else None
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.lookup_time = 0.0
+
+    def _get(self, key):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+            return value
+        if self.store is not None:
+            value = self.store.get(key)
+            if value is not None:
+                self.store_hits += 1
+                self._remember(key, value)
+        return value
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    # the cached solution of `key` mapped back onto board, or None
+    def _lookup(self, key, transform, board):
+        value = self._get(key)
+        if value is None:
+            return None
+        solution = unpack_cells(value)
+        if transform is not None:
+            solution = invert_transform(solution, transform)
+        solution = [solution[r * 9:(r + 1) * 9] for r in range(9)]
+        if not is_solution(solution, board):
+            self.entries.pop(key, None)
+            return None
+        return solution
+
+    def solve(self, puzzle, method='csp', stats=None, budget=None):
+        board = to_board(puzzle)
+        if len(board) != 9:
+            return solve(board, method, stats, budget)
+
+        start = time.perf_counter()
+        cells = [v for row in board for v in row]
+        exact = pack_cells(cells)
+        solution = self._lookup(exact, None, board)
+        if solution is None:
+            form = canonical_form(cells)
+            if form is None:
+                key, transform = exact, None
+            else:
+                key, transform = pack_cells(form[0]), form[1]
+                solution = self._lookup(key, transform, board)
+                if solution is not None:
+                    self._remember(exact, pack_cells([v for row in solution for v in row]))
+        self.lookup_time += time.perf_counter() - start
+
+        if solution is not None:
+            self.hits += 1
+            return solution
+
+        self.misses += 1
+        result = solve(board, method, stats, budget)
+        if result and is_solution(result, board):
+            solution = [v for row in result for v in row]
+            if transform is not None:
+                self._remember(exact, pack_cells(solution))
+                solution = apply_transform(solution, transform)
+            value = pack_cells(solution)
+            self._remember(key, value)
+            if self.store is not None:
+                self.store.put(key, value)
+        return result
+
+    def cache_info(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'store_hits': self.store_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'mean_lookup_ms': 1000 * self.lookup_time / lookups if lookups else 0.0,
+            'entries': len(self.entries),
+        }
+
+    def clear(self):
+        self.entries.clear()
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,544 @@
+# Sudoku Solver (CSP)
+# Constraint Propagation + Search(Backtracking)
+
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations
+
+from .grid import SYMBOLS, geometry, popcounts
+from .stats import phase
+
+rows = 'ABCDEFGHI'
+cols = '123456789'
+digits = '123456789'
+
+#Creates combinations of row labels and column labels Ex: cross("A", "123") → ["A1", "A2", "A3"]
+def cross(a, b):
+    return [x + y for x in a for y in b]
+
+boxes = cross(rows, cols)
+row_units = [cross(r, cols) for r in rows]
+column_units = [cross(rows, c) for c in cols]
+square_units = [
+    cross(rs, cs)
+    for rs in ('ABC', 'DEF', 'GHI')
+    for cs in ('123', '456', '789')
+]
+
+# Stores all units in one list
+unitlist = row_units + column_units + square_units
+"""
+units["A1"] →
+[
+  Row A,
+  Column 1,
+  Top-left square
+]
+
+peers["A1"] →
+(all boxes in same row, column, or square except A1)
+
+"""
+units = {box: [u for u in unitlist if box in u] for box in boxes}
+peers = {box: set(sum(units[box], [])) - {box} for box in boxes}
+
+# Integer tables used by the solver core
+"""
+One set of tables per board size, for box side n (3 → 9x9, 4 → 16x16,
+5 → 25x25). Box boxes[i] is cell i. Candidates are kept as a list of
+cell masks, side bits wide: bit k is set while digits[k] is still
+possible. Python ints have no fixed width, so the same rules work
+unchanged on 16 and 25 candidate bits.
+
+rows, cols   → row letters and column numbers ("A1" .. "Y25")
+units[u]     → the cell indices of unit u (unitlist order)
+units_of[i]  → the indices of the 3 units containing cell i
+peers[i]     → the peer cell indices of cell i
+popcount[m]  → number of candidates in mask m
+"""
+Tables = namedtuple('Tables', 'n rows cols digits boxes full units units_of peers bit digit popcount')
+
+@lru_cache(maxsize=None)
+def tables(n):
+    geo = geometry(n)
+    side = geo.side
+    t_rows = 'ABCDEFGHIJKLMNOPQRSTUVWXY'[:side]
+    t_cols = [str(c) for c in range(1, side + 1)]
+    t_digits = SYMBOLS[:side]
+    return Tables(
+        n, t_rows, t_cols, t_digits, cross(t_rows, t_cols), (1 << side) - 1,
+        geo.units, geo.units_of, geo.peers,
+        {d: 1 << k for k, d in enumerate(t_digits)},
+        {1 << k: d for k, d in enumerate(t_digits)},
+        popcounts(side),
+    )
+
+# 9x9 tables, the defaults everywhere below
+STANDARD = tables(3)
+ALL = STANDARD.full
+INDEX = {box: i for i, box in enumerate(boxes)}
+UNITS = STANDARD.units
+UNITS_OF = STANDARD.units_of
+PEERS = STANDARD.peers
+BIT = STANDARD.bit
+DIGIT = STANDARD.digit
+POPCOUNT = STANDARD.popcount
+
+# Convert grid string into a dictionary of possible values
+def grid2values(grid, n=3):
+    t = tables(n)
+    values = {}
+    for box, char in zip(t.boxes, grid):
+        if char in t.digits:
+            values[box] = char
+        else:
+            values[box] = t.digits
+    return values
+
+# Convert grid string into a list of candidate masks
+def grid2masks(grid, n=3):
+    t = tables(n)
+    return [t.bit.get(char, t.full) for char, _ in zip(grid, t.boxes)]
+
+# Convert candidate masks back into the dictionary form used by display()
+def masks2values(masks, n=3):
+    t = tables(n)
+    return {
+        box: ''.join(d for d in t.digits if masks[i] & t.bit[d])
+        for i, box in enumerate(t.boxes)
+    }
+
+
+# Display Sudoku grid
+def display(values, n=3):
+    t = tables(n)
+    width = 1 + max(len(values[b]) for b in t.boxes)
+    line = '+'.join(['-' * (width * n)] * n)
+
+    for i, r in enumerate(t.rows):
+        print(
+            ''.join(values[r + c].center(width) + ('|' if j % n == n - 1 and j < len(t.cols) - 1 else '')
+                    for j, c in enumerate(t.cols))
+        )
+        if i % n == n - 1 and i < len(t.rows) - 1:
+            print(line)
+    print()
+
+# Constraint Strategies
+# Each rule narrows masks in place, appends the cells it changed to `changed`
+# and returns False as soon as it finds a contradiction. `t` holds the
+# tables for the board size.
+
+# Elimination Rule: a solved cell removes its digit from every peer
+def eliminate(masks, box, changed, t=STANDARD):
+    digit = masks[box]
+    for peer in t.peers[box]:
+        if masks[peer] & digit:
+            remaining = masks[peer] & ~digit
+            if not remaining:
+                return False
+            masks[peer] = remaining
+            changed.append(peer)
+    return True
+
+# Only Choice Rule: a digit with a single place in the unit goes there
+def only_choice(masks, unit, changed, t=STANDARD):
+    once = twice = 0
+    for box in unit:
+        m = masks[box]
+        twice |= once & m
+        once |= m
+    if once != t.full:
+        return False
+
+    singles = once & ~twice
+    if singles:
+        for box in unit:
+            m = masks[box] & singles
+            if m and masks[box] != m:
+                if t.popcount[m] > 1:
+                    return False
+                masks[box] = m
+                changed.append(box)
+    return True
+
+# Naked Twins Rule: two cells sharing the same two candidates own them
+def naked_twins(masks, unit, changed, t=STANDARD):
+    popcount = t.popcount
+    seen = {}
+    for box in unit:
+        m = masks[box]
+        if popcount[m] == 2:
+            seen[m] = seen.get(m, 0) + 1
+
+    for val, count in seen.items():
+        if count > 2:
+            return False
+        if count == 2:
+            for box in unit:
+                m = masks[box]
+                if m != val and m & val:
+                    m &= ~val
+                    if not m:
+                        return False
+                    masks[box] = m
+                    changed.append(box)
+    return True
+
+# Board-wide rules
+# These look across units, so they do not fit the per-unit work queue.
+# reduce_puzzle runs them only once the queue is empty, and goes back to
+# the queue as soon as one of them narrows a cell. Same contract as the
+# rules above, but over the whole board: (masks, changed, t).
+
+# Remove `digits` from `cells`
+def remove_digits(masks, cells, digits, changed):
+    for box in cells:
+        m = masks[box]
+        if m & digits:
+            m &= ~digits
+            if not m:
+                return False
+            masks[box] = m
+            changed.append(box)
+    return True
+
+# Naked subset: k cells whose candidates are k digits in all own them
+def naked_subset(masks, unit, changed, t, k):
+    popcount = t.popcount
+    open_cells = [box for box in unit if 1 < popcount[masks[box]] <= k]
+    for group in combinations(open_cells, k):
+        digits = 0
+        for box in group:
+            digits |= masks[box]
+        if popcount[digits] < k:
+            return False
+        if popcount[digits] == k:
+            if not remove_digits(masks, [box for box in unit if box not in group], digits, changed):
+                return False
+    return True
+
+# Hidden subset: k digits that fit only in the same k cells fill them
+def hidden_subset(masks, unit, changed, t, k):
+    popcount = t.popcount
+    places = {}
+    for i, box in enumerate(unit):
+        m = masks[box]
+        while m:
+            bit = m & -m
+            m ^= bit
+            places[bit] = places.get(bit, 0) | 1 << i
+    open_digits = [bit for bit, where in places.items() if 1 < popcount[where] <= k]
+    for group in combinations(open_digits, k):
+        digits = where = 0
+        for bit in group:
+            digits |= bit
+            where |= places[bit]
+        if popcount[where] < k:
+            return False
+        if popcount[where] == k:
+            for i, box in enumerate(unit):
+                if where >> i & 1 and masks[box] & ~digits:
+                    masks[box] &= digits
+                    changed.append(box)
+    return True
+
+def naked_triples(masks, changed, t=STANDARD):
+    return all(naked_subset(masks, unit, changed, t, 3) for unit in t.units)
+
+def hidden_pairs(masks, changed, t=STANDARD):
+    return all(hidden_subset(masks, unit, changed, t, 2) for unit in t.units)
+
+def hidden_triples(masks, changed, t=STANDARD):
+    return all(hidden_subset(masks, unit, changed, t, 3) for unit in t.units)
+
+# Box/line intersections of size n: (shared cells, rest of box, rest of line)
+@lru_cache(maxsize=None)
+def intersections(n):
+    t = tables(n)
+    side = n * n
+    found = []
+    for box in t.units[2 * side:]:
+        for line in t.units[:2 * side]:
+            shared = set(box) & set(line)
+            if shared:
+                found.append((tuple(sorted(shared)),
+                              tuple(c for c in box if c not in shared),
+                              tuple(c for c in line if c not in shared)))
+    return found
+
+def _intersection_rule(masks, changed, t, pointing):
+    for shared, box_rest, line_rest in intersections(t.n):
+        here = elsewhere = 0
+        for box in shared:
+            here |= masks[box]
+        for box in (box_rest if pointing else line_rest):
+            elsewhere |= masks[box]
+        confined = here & ~elsewhere
+        if confined and not remove_digits(masks, line_rest if pointing else box_rest, confined, changed):
+            return False
+    return True
+
+# Pointing Pairs: a digit confined to one line inside a box leaves the rest of the line
+def pointing_pairs(masks, changed, t=STANDARD):
+    return _intersection_rule(masks, changed, t, True)
+
+# Box/Line Reduction: a digit confined to one box inside a line leaves the rest of the box
+def box_line(masks, changed, t=STANDARD):
+    return _intersection_rule(masks, changed, t, False)
+
+# X-Wing: a digit with the same two places in two rows leaves the rest of
+# those two columns (and the same with rows and columns swapped)
+def x_wing(masks, changed, t=STANDARD):
+    side = len(t.digits)
+    popcount = t.popcount
+    rows, cols = t.units[:side], t.units[side:2 * side]
+    for base, cover in ((rows, cols), (cols, rows)):
+        for k in range(side):
+            bit = 1 << k
+            seen = {}
+            for line in base:
+                where = 0
+                for i, box in enumerate(line):
+                    if masks[box] & bit:
+                        where |= 1 << i
+                if popcount[where] != 2:
+                    continue
+                other = seen.setdefault(where, line)
+                if other is line:
+                    continue
+                keep = set(other) | set(line)
+                for i in range(side):
+                    if where >> i & 1:
+                        rest = [box for box in cover[i] if box not in keep]
+                        if not remove_digits(masks, rest, bit, changed):
+                            return False
+    return True
+
+# Rule selection
+"""
+RULES lists every optional rule, cheapest first (by time per call on
+stuck 9x9 boards); reduce_puzzle and the
+searches take a `rules` tuple naming the ones to use (eliminate and
+only_choice always run). naked_twins works from the unit queue with
+only_choice; the others are tried in RULES order when the queue runs dry,
+and the first one that narrows anything sends propagation back to the
+queue. DEFAULT_RULES is the original rule set.
+"""
+BOARD_RULES = {
+    'naked_triples': naked_triples,
+    'box_line': box_line,
+    'pointing_pairs': pointing_pairs,
+    'hidden_pairs': hidden_pairs,
+    'x_wing': x_wing,
+    'hidden_triples': hidden_triples,
+}
+RULES = ('naked_twins',) + tuple(BOARD_RULES)
+DEFAULT_RULES = ('naked_twins',)
+
+@lru_cache(maxsize=None)
+def rule_set(rules):
+    unknown = set(rules) - set(RULES)
+    if unknown:
+        raise ValueError("unknown rule %s (choose from %s)" % (', '.join(sorted(unknown)), ', '.join(RULES)))
+    return 'naked_twins' in rules, tuple((name, BOARD_RULES[name]) for name in BOARD_RULES if name in rules)
+
+# Puzzle Reduction: propagate from a work queue of changed cells
+"""
+Only cells that changed are revisited: a changed cell that became solved
+is eliminated from its peers, and each of its three units is re-checked
+with only_choice and naked_twins. Propagation stops when the queue is
+empty instead of sweeping the whole board until nothing moves; then the
+board-wide rules in `rules` get their turn. With stats, each rule's
+narrowed cells and firings are counted with stats.rule().
+"""
+def reduce_puzzle(masks, queue=None, t=STANDARD, stats=None, rules=DEFAULT_RULES):
+    if queue is None:
+        queue = range(len(masks))
+    popcount, units, units_of = t.popcount, t.units, t.units_of
+    twins, board_rules = rule_set(tuple(rules))
+
+    cell_queue = list(queue)
+    dirty_units = set()
+    changed = []
+
+    while True:
+        while cell_queue or dirty_units:
+            while cell_queue:
+                box = cell_queue.pop()
+                m = masks[box]
+                if not m:
+                    return False
+                if popcount[m] == 1 and not eliminate(masks, box, changed, t):
+                    return False
+                dirty_units.update(units_of[box])
+                if changed:
+                    if stats is not None:
+                        stats.rule('eliminate', len(changed))
+                    cell_queue.extend(changed)
+                    changed.clear()
+
+            if dirty_units:
+                unit = units[dirty_units.pop()]
+                if not only_choice(masks, unit, changed, t):
+                    return False
+                singles = len(changed)
+                if twins and not naked_twins(masks, unit, changed, t):
+                    return False
+                if changed:
+                    if stats is not None:
+                        stats.rule('only_choice', singles)
+                        stats.rule('naked_twins', len(changed) - singles)
+                    cell_queue.extend(changed)
+                    changed.clear()
+
+        if board_rules and all(popcount[m] == 1 for m in masks):
+            return masks
+        for name, rule in board_rules:
+            if not rule(masks, changed, t):
+                return False
+            if changed:
+                if stats is not None:
+                    stats.rule(name, len(set(changed)))
+                cell_queue.extend(changed)
+                changed.clear()
+                break
+        else:
+            return masks
+
+# Most constrained unsolved box, or None when every box is solved
+def select_box(masks, t=STANDARD):
+    popcount = t.popcount
+    best = None
+    fewest = len(t.digits) + 1
+    for box, m in enumerate(masks):
+        n = popcount[m]
+        if 1 < n < fewest:
+            best, fewest = box, n
+            if n == 2:
+                break
+    return best
+
+# Search (Backtracking)
+# a budget (see budget.py) is charged one node per call
+def search(masks, queue=None, stats=None, t=STANDARD, depth=0, budget=None, rules=DEFAULT_RULES):
+    if stats is not None:
+        stats.nodes += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+    if budget is not None:
+        budget.charge()
+    masks = reduce_puzzle(masks, queue, t, stats, rules)
+    if masks is False:
+        return False
+
+    best = select_box(masks, t)
+    if best is None:
+        return masks
+
+    m = masks[best]
+    while m:
+        digit = m & -m
+        m ^= digit
+        new_masks = masks.copy()
+        new_masks[best] = digit
+        attempt = search(new_masks, (best,), stats, t, depth + 1, budget, rules)
+        if attempt:
+            return attempt
+        if stats is not None:
+            stats.backtracks += 1
+
+    return False
+
+# Solution counting: the same search, but it keeps going after a solution
+# and stops as soon as `limit` solutions have been found (None = count all)
+def count_search(masks, queue=None, limit=None, stats=None, t=STANDARD, depth=0, rules=DEFAULT_RULES,
+                 found=None):
+    if stats is not None:
+        stats.nodes += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+    masks = reduce_puzzle(masks, queue, t, stats, rules)
+    if masks is False:
+        return 0
+
+    best = select_box(masks, t)
+    if best is None:
+        if found is not None and not found:
+            found.append(masks)
+        return 1
+
+    count = 0
+    m = masks[best]
+    while m:
+        digit = m & -m
+        m ^= digit
+        new_masks = masks.copy()
+        new_masks[best] = digit
+        count += count_search(new_masks, (best,), None if limit is None else limit - count, stats, t,
+                              depth + 1, rules, found)
+        if limit is not None and count >= limit:
+            break
+    return count
+# Solver
+# grid is a string of n**4 characters; n is the box side (3 for 9x9)
+# Raises BudgetExhausted if `budget` runs out first; `rules` picks the
+# optional propagation rules (see RULES)
+def solve(grid, stats=None, n=3, budget=None, rules=DEFAULT_RULES):
+    with phase(stats, 'search'):
+        masks = search(grid2masks(grid, n), stats=stats, t=tables(n), budget=budget, rules=rules)
+    if masks is False:
+        return False
+    return masks2values(masks, n)
+
+# Number of solutions of grid, counting no further than limit
+def count_solutions(grid, limit=2, stats=None, n=3, rules=DEFAULT_RULES):
+    return count_search(grid2masks(grid, n), limit=limit, stats=stats, t=tables(n), rules=rules)
+
+# Uniqueness check
+"""
+A single count-to-2 pass (count_search with limit=2) that also keeps the
+first solution it reaches, so validating a puzzle and solving it share
+one search and one root propagation. A unique puzzle still needs the
+whole tree searched to rule out a second solution; a puzzle with two
+stops at the second. Returns the solution (as solve() does) when there
+is exactly one, else False. Puzzles with fewer than 17 clues are
+rejected without searching, since none of them has a unique solution
+(the 17-clue bound is only known for 9x9).
+"""
+MIN_CLUES = 17
+
+def unique_solution(grid, stats=None, n=3, rules=DEFAULT_RULES):
+    t = tables(n)
+    masks = grid2masks(grid, n)
+    if n == 3 and sum(t.popcount[m] == 1 for m in masks) < MIN_CLUES:
+        return False
+    found = []
+    if count_search(masks, limit=2, stats=stats, t=t, rules=rules, found=found) != 1:
+        return False
+    return masks2values(found[0], n)
+
+def has_unique_solution(grid, stats=None, n=3, rules=DEFAULT_RULES):
+    return unique_solution(grid, stats, n, rules) is not False
+# Example
+if __name__ == "__main__":
+
+    puzzle = (
+        "53..7...."
+        "6..195..."
+        ".98....6."
+        "8...6...3"
+        "4..8.3..1"
+        "7...2...6"
+        ".6....28."
+        "...419..5"
+        "....8..79"
+    )
+
+    print("Original Sudoku:")
+    display(grid2values(puzzle))
+
+    solution = solve(puzzle)
+
+    print("Solved Sudoku:")
+    display(solution)
@@ -0,0 +1,277 @@
+# Packed puzzle files
+# A binary format for large 9x9 puzzle sets. A 16-byte header is followed by
+# one fixed-size record per puzzle: the puzzle packed 4 bits per cell (the
+# grid.pack_cells layout, 41 bytes), then its packed solution when the file
+# has a solution column. Puzzle i starts at HEADER.size + i * record_size,
+# so a reader maps the file and indexes into it without parsing anything.
+#
+#   python -m sudoku_solver.dataset pack puzzles.txt puzzles.sdk
+#   python -m sudoku_solver.dataset pack puzzles.txt puzzles.sdk --solve dlx
+#   python -m sudoku_solver.dataset unpack puzzles.sdk puzzles.txt
+
+import argparse
+import itertools
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from .batch import ERROR, UNSOLVABLE, chunked, read_puzzles, solve_stream
+from .grid import PACKED_SIZE
+
+MAGIC = b'SDKP'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ')  # magic, version, flags, puzzle count
+SOLUTIONS = 1                     # flag: every record carries a solution
+
+# -----------------------------
+# packing, many puzzles at a time
+# -----------------------------
+# '.' and '0' are empty cells; any other character is left >= 10 by the
+# translation and rejected.
+_DIGITS = bytes.maketrans(b'.0123456789', bytes([0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9]))
+
+
+# 81-character strings -> (B, 81) uint8 array
+def parse(puzzles):
+    if any(len(p) != 81 for p in puzzles):
+        raise ValueError("puzzles must be 81 characters each")
+    data = ''.join(puzzles).encode('ascii').translate(_DIGITS)
+    cells = np.frombuffer(data, dtype=np.uint8)
+    if cells.size and cells.max() > 9:
+        raise ValueError("puzzles may only contain 1-9, '.' and '0'")
+    return cells.reshape(-1, 81)
+
+
+# (B, 81) cell array -> (B, PACKED_SIZE) packed bytes, as grid.pack_cells
+def pack(cells):
+    cells = np.asarray(cells, dtype=np.uint8)
+    padded = np.zeros((cells.shape[0], 2 * PACKED_SIZE), dtype=np.uint8)
+    padded[:, :81] = cells
+    return (padded[:, 0::2] << 4) | padded[:, 1::2]
+
+
+# (B, PACKED_SIZE) packed bytes -> (B, 81) cell array
+def unpack(packed):
+    packed = np.asarray(packed, dtype=np.uint8)
+    cells = np.empty((packed.shape[0], 2 * PACKED_SIZE), dtype=np.uint8)
+    cells[:, 0::2] = packed >> 4
+    cells[:, 1::2] = packed & 15
+    return cells[:, :81]
+
+
+# (B, 81) cell array -> 81-character strings
+def format_cells(cells):
+    text = (np.asarray(cells, dtype=np.uint8) + ord('0')).tobytes().decode('ascii').replace('0', '.')
+    return [text[i:i + 81] for i in range(0, len(text), 81)]
+
+# -----------------------------
+# writer
+# -----------------------------
+"""
+Appends records and fills in the puzzle count when closed. Puzzles are
+81-character strings; with solutions=True every write_many() call also
+takes their solutions (None or "unsolvable" for a puzzle without one,
+stored as an empty grid).
+"""
+class PackedWriter:
+    def __init__(self, path, solutions=False):
+        self.solutions = solutions
+        self.count = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, SOLUTIONS if solutions else 0, 0))
+
+    def write_many(self, puzzles, solutions=None):
+        puzzles = list(puzzles)
+        records = pack(parse(puzzles))
+        if self.solutions:
+            if solutions is None or len(solutions) != len(puzzles):
+                raise ValueError("a solution (or None) is needed for every puzzle")
+            solutions = [s if s and s != UNSOLVABLE else '.' * 81 for s in solutions]
+            records = np.hstack((records, pack(parse(solutions))))
+        elif solutions is not None:
+            raise ValueError("this file has no solution column")
+        self.file.write(records.tobytes())
+        self.count += len(puzzles)
+
+    def write(self, puzzle, solution=None):
+        self.write_many([puzzle], None if not self.solutions else [solution])
+
+    def close(self):
+        if self.file is None:
+            return
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, SOLUTIONS if self.solutions else 0, self.count))
+        self.file.close()
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# -----------------------------
+# reader
+# -----------------------------
+"""
+Maps a packed file read-only. `records` is a (count, record_size) uint8
+array over the mapping itself, so slicing it copies nothing; cells()
+decodes a range of it into a (B, 81) array for batch solving, and
+batches() walks the whole file that way. Indexing returns 81-character
+strings. Views taken from `records` keep the mapping alive after close().
+"""
+class PackedPuzzles:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < HEADER.size:
+            self.map.close()
+            raise ValueError("%s is not a packed puzzle file" % path)
+        magic, version, flags, count = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError("%s is not a packed puzzle file" % path)
+        self.has_solutions = bool(flags & SOLUTIONS)
+        self.record_size = PACKED_SIZE * (2 if self.has_solutions else 1)
+        if len(self.map) < HEADER.size + count * self.record_size:
+            self.map.close()
+            raise ValueError("%s is truncated" % path)
+        self.count = count
+        self.records = np.frombuffer(self.map, dtype=np.uint8, count=count * self.record_size,
+                                     offset=HEADER.size).reshape(count, self.record_size)
+
+    def __len__(self):
+        return self.count
+
+    def cells(self, start=0, stop=None, solutions=False):
+        if solutions and not self.has_solutions:
+            raise ValueError("this file has no solution column")
+        column = slice(PACKED_SIZE, None) if solutions else slice(0, PACKED_SIZE)
+        return unpack(self.records[start:stop, column])
+
+    def batches(self, size=4096, solutions=False):
+        for start in range(0, self.count, size):
+            yield start, self.cells(start, start + size, solutions)
+
+    def _index(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("puzzle index out of range")
+        return i
+
+    # solution of puzzle i, or None (no solution column, or no solution)
+    def solution(self, i):
+        if not self.has_solutions:
+            return None
+        i = self._index(i)
+        text = format_cells(self.cells(i, i + 1, solutions=True))[0]
+        return text if text != '.' * 81 else None
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.count)
+            if step == 1:
+                return format_cells(self.cells(start, max(start, stop)))
+            return [self[j] for j in range(start, stop, step)]
+        i = self._index(i)
+        return format_cells(self.cells(i, i + 1))[0]
+
+    def __iter__(self):
+        for _, cells in self.batches():
+            yield from format_cells(cells)
+
+    def close(self):
+        self.records = None
+        try:
+            self.map.close()
+        except BufferError:
+            pass  # views are still out; the mapping goes when they do
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_packed(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+# -----------------------------
+# converters
+# -----------------------------
+"""
+Text in either format read_puzzles() takes (81-character lines or the
+9-line grids of "new 2.txt") to a packed file. With `method`, the puzzles
+are solved on the way and the solutions stored. A single solve_stream
+(one process pool) runs over the whole input, and its solutions are
+taken chunk by chunk as the records are written.
+"""
+def pack_file(input_path, output_path, method=None, processes=None, chunk_size=10000):
+    with open(input_path, 'r') as src, PackedWriter(output_path, solutions=method is not None) as out:
+        puzzles = read_puzzles(src)
+        solutions = None
+        if method is not None:
+            puzzles, queued = itertools.tee(puzzles)
+            solutions = solve_stream(queued, processes, method=method)
+        try:
+            for chunk in chunked(puzzles, chunk_size):
+                for puzzle in chunk:
+                    if puzzle.startswith(ERROR):
+                        raise ValueError(puzzle)
+                if solutions is None:
+                    out.write_many(chunk)
+                else:
+                    out.write_many(chunk, list(itertools.islice(solutions, len(chunk))))
+        finally:
+            if solutions is not None:
+                solutions.close()
+        return out.count
+
+
+# Packed file back to 81-character lines (solutions, if asked, after a space)
+def unpack_file(input_path, output_path, solutions=False):
+    with PackedPuzzles(input_path) as packed, open(output_path, 'w') as dst:
+        if solutions and not packed.has_solutions:
+            raise ValueError("%s has no solution column" % input_path)
+        for start, cells in packed.batches():
+            puzzles = format_cells(cells)
+            if solutions:
+                answers = format_cells(packed.cells(start, start + len(puzzles), solutions=True))
+                puzzles = ['%s %s' % (p, s if s != '.' * 81 else UNSOLVABLE)
+                           for p, s in zip(puzzles, answers)]
+            dst.write(''.join(p + '\n' for p in puzzles))
+        return len(packed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert Sudoku puzzle files to and from the packed format.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("pack", help="text puzzles -> packed file")
+    p.add_argument("input", help="puzzle file (81-character lines or 9x9 grids)")
+    p.add_argument("output", help="packed file to write")
+    p.add_argument("--solve", metavar="METHOD", default=None,
+                   help="also store solutions found with this method")
+    p.add_argument("-p", "--processes", type=int, default=None,
+                   help="worker processes for --solve (default: all cores)")
+    u = commands.add_parser("unpack", help="packed file -> 81-character lines")
+    u.add_argument("input", help="packed file")
+    u.add_argument("output", help="text file to write")
+    u.add_argument("--solutions", action="store_true", help="append each solution to its puzzle")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        count = pack_file(args.input, args.output, args.solve, args.processes)
+        print("packed %d puzzles (%d bytes)" % (count, os.path.getsize(args.output)), file=sys.stderr)
+    else:
+        count = unpack_file(args.input, args.output, args.solutions)
+        print("unpacked %d puzzles" % count, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
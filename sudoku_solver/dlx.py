@@ -0,0 +1,221 @@
+# Sudoku Solver (Dancing Links)
+# Sudoku as exact cover, solved with Knuth's Algorithm X on dancing links.
+
+from .csp import boxes, digits
+
+"""
+Exact-cover matrix
+
+Each of the 729 rows is a candidate "digit d in cell (r, c)" and covers
+4 of the 324 columns:
+
+  cell (r, c) is filled          0 ..  80
+  row r contains d              81 .. 161
+  column c contains d          162 .. 242
+  box b contains d             243 .. 323
+
+A solution is a set of 81 rows that covers every column exactly once.
+"""
+N_COLUMNS = 324
+N_ROWS = 729
+
+def row_columns(r, c, d):
+    b = (r // 3) * 3 + c // 3
+    return (r * 9 + c, 81 + r * 9 + d, 162 + c * 9 + d, 243 + b * 9 + d)
+
+# Dancing links
+"""
+The matrix lives in flat lists indexed by node number: node 0 is the root,
+nodes 1..324 are the column headers and every matrix row adds 4 nodes.
+L/R/U/D are the circular links, C the column header of a node, ROW its
+matrix row and S the number of nodes left in each column. The full matrix
+is built once; each solve works on copies of the link lists.
+"""
+def build_matrix():
+    size = 1 + N_COLUMNS + N_ROWS * 4
+    L = [0] * size
+    R = [0] * size
+    U = list(range(size))
+    D = list(range(size))
+    C = list(range(size))
+    ROW = [-1] * size
+    S = [0] * (N_COLUMNS + 1)
+    first_node = [0] * N_ROWS
+
+    for i in range(N_COLUMNS + 1):
+        L[i] = i - 1 if i else N_COLUMNS
+        R[i] = i + 1 if i < N_COLUMNS else 0
+
+    node = N_COLUMNS + 1
+    for row in range(N_ROWS):
+        r, c, d = row // 81, (row // 9) % 9, row % 9
+        first_node[row] = node
+        for k, column in enumerate(row_columns(r, c, d)):
+            col = column + 1
+            C[node] = col
+            ROW[node] = row
+            U[node] = U[col]
+            D[node] = col
+            D[U[col]] = node
+            U[col] = node
+            S[col] += 1
+            if k == 0:
+                L[node] = R[node] = node
+            else:
+                L[node] = node - 1
+                R[node] = node - k
+                R[node - 1] = node
+                L[node - k] = node
+            node += 1
+
+    return L, R, U, D, C, ROW, S, first_node
+
+_MATRIX = None
+
+def _matrix():
+    global _MATRIX
+    if _MATRIX is None:
+        _MATRIX = build_matrix()
+    return _MATRIX
+
+
+class ExactCover:
+    def __init__(self):
+        L, R, U, D, C, ROW, S, first_node = _matrix()
+        self.L, self.R, self.U, self.D = L[:], R[:], U[:], D[:]
+        self.S = S[:]
+        self.C, self.ROW, self.first_node = C, ROW, first_node
+        self.covered = [False] * (N_COLUMNS + 1)
+
+    def cover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        self.covered[c] = True
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+        self.covered[c] = False
+
+    # Fix a matrix row in advance (a given). False if it clashes.
+    def select(self, row):
+        node = self.first_node[row]
+        columns = [self.C[node + k] for k in range(4)]
+        if any(self.covered[c] for c in columns):
+            return False
+        for c in columns:
+            self.cover(c)
+        return True
+
+    # Algorithm X: always branch on the column with the fewest rows left
+    # (a budget is charged one node per call and raises BudgetExhausted)
+    def search(self, chosen, stats=None, budget=None):
+        if stats is not None:
+            stats.nodes += 1
+            if len(chosen) > stats.max_depth:
+                stats.max_depth = len(chosen)
+        if budget is not None:
+            budget.charge()
+        R, D, S = self.R, self.D, self.S
+
+        if R[0] == 0:
+            yield chosen
+            return
+
+        c = R[0]
+        best, fewest = c, S[c]
+        while c != 0 and fewest > 1:
+            if S[c] < fewest:
+                best, fewest = c, S[c]
+            c = R[c]
+        if fewest == 0:
+            return
+
+        self.cover(best)
+        r = D[best]
+        while r != best:
+            chosen.append(self.ROW[r])
+            j = self.R[r]
+            while j != r:
+                self.cover(self.C[j])
+                j = self.R[j]
+
+            yield from self.search(chosen, stats, budget)
+
+            j = self.L[r]
+            while j != r:
+                self.uncover(self.C[j])
+                j = self.L[j]
+            chosen.pop()
+            if stats is not None:
+                stats.backtracks += 1
+            r = D[r]
+        self.uncover(best)
+
+# Solutions as 81-character strings
+def solutions(grid, limit=None, stats=None, budget=None):
+    matrix = ExactCover()
+    cells = [0] * 81
+    for i, char in enumerate(grid[:81]):
+        if char in digits:
+            d = int(char) - 1
+            if not matrix.select(i * 9 + d):
+                return
+            cells[i] = d + 1
+
+    found = 0
+    for chosen in matrix.search([], stats, budget):
+        for row in chosen:
+            cells[row // 9] = row % 9 + 1
+        yield ''.join(map(str, cells))
+        found += 1
+        if limit is not None and found >= limit:
+            return
+
+# Solver: same interface as the CSP solve()
+def solve(grid, stats=None, budget=None):
+    for solution in solutions(grid, 1, stats, budget):
+        return dict(zip(boxes, solution))
+    return False
+
+
+if __name__ == "__main__":
+    from .csp import display, grid2values
+
+    puzzle = (
+        "53..7...."
+        "6..195..."
+        ".98....6."
+        "8...6...3"
+        "4..8.3..1"
+        "7...2...6"
+        ".6....28."
+        "...419..5"
+        "....8..79"
+    )
+
+    print("Original Sudoku:")
+    display(grid2values(puzzle))
+
+    print("Solved Sudoku:")
+    display(solve(puzzle))
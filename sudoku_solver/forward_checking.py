@@ -0,0 +1,515 @@
+from collections import deque, namedtuple
+from functools import lru_cache
+from math import isqrt
+
+from .grid import geometry, popcounts
+from .stats import phase
+
+def print_grid(grid):
+    side = len(grid)
+    n = isqrt(side)
+    width = len(str(side))
+    for i in range(side):
+        if i % n == 0 and i != 0:
+            print("-" * ((width + 1) * (side + n - 1) - 1))
+        for j in range(side):
+            if j % n == 0 and j != 0:
+                print("|".rjust(width), end=" ")
+            print(str(grid[i][j]).rjust(width), end=" ")
+        print()
+    print()
+
+
+def is_complete(grid):
+    return all(all(cell != 0 for cell in row) for row in grid)
+
+
+# Static tables, cell index = r * side + c
+"""
+One set of tables per box side n (grid side n*n), STANDARD being the
+9x9 set. Domains are bitmasks: bit v is set while value v is possible.
+They stay plain ints, side + 1 bits wide, so 16x16 and 25x25 boards use
+the same code; only the popcount of the widest masks is computed
+instead of looked up.
+"""
+Tables = namedtuple('Tables', 'side full popcount value_of neighbors units units_of')
+
+@lru_cache(maxsize=None)
+def tables(n):
+    geo = geometry(n)
+    values = range(1, geo.side + 1)
+    return Tables(geo.side, sum(1 << v for v in values), popcounts(geo.side + 1),
+                  {1 << v: v for v in values}, geo.peers, geo.units, geo.units_of)
+
+STANDARD = tables(3)
+
+
+def init_domains(grid):
+    t = tables(isqrt(len(grid)))
+    domains = []
+    for row in grid:
+        for value in row:
+            domains.append(t.full if value == 0 else 1 << value)
+
+    # Initial constraint propagation
+    for cell, dom in enumerate(domains):
+        if t.popcount[dom] == 1:
+            prune(domains, cell, dom, t=t)
+
+    return domains
+
+
+def prune(domains, cell, bit, trail=None, t=STANDARD):
+    """
+    Remove `bit` from every neighbour of `cell`, recording the old domains
+    on `trail`. Returns the neighbours that were narrowed to one value, or
+    None when a domain became empty.
+    """
+    popcount = t.popcount
+    forced = []
+    for n in t.neighbors[cell]:
+        dom = domains[n]
+        if dom & bit:
+            if trail is not None:
+                trail.append((n, dom))
+            dom &= ~bit
+            domains[n] = dom
+            if not dom:
+                return None
+            if popcount[dom] == 1:
+                forced.append(n)
+    return forced
+
+
+def undo(domains, trail, mark):
+    while len(trail) > mark:
+        cell, dom = trail.pop()
+        domains[cell] = dom
+
+
+def hidden_singles(domains, unit, trail, t=STANDARD):
+    """
+    A value with a single possible cell in a unit must go there. Returns
+    the cells that were narrowed, or None when some value has no place.
+    """
+    once = twice = 0
+    for cell in unit:
+        dom = domains[cell]
+        twice |= once & dom
+        once |= dom
+    if once != t.full:
+        return None
+
+    forced = []
+    singles = once & ~twice
+    if singles:
+        for cell in unit:
+            dom = domains[cell]
+            only = dom & singles
+            if only and only != dom:
+                if t.popcount[only] > 1:
+                    return None
+                trail.append((cell, dom))
+                domains[cell] = only
+                forced.append(cell)
+    return forced
+
+
+def forward_check(domains, cells, trail, mode='fc', t=STANDARD, stats=None):
+    """
+    Propagate the values of `cells` (whose domains are single values).
+
+    fc  → remove each value from its neighbours; any neighbour left with a
+          single value is assigned and propagated in turn.
+    mac → additionally apply hidden singles to a queue of units: a
+          value with only one cell left in a unit is assigned to it, and
+          a value with no cell left is a dead end. Only the units of
+          `cells` and of cells whose domain changed are queued. This is
+          weaker than full arc consistency on a unit's all-different
+          constraint, which would also catch e.g. two values confined
+          to the same two cells.
+
+    With stats, the domain reductions of each rule (the trail entries it
+    adds) are counted with stats.rule().
+    """
+    units, units_of = t.units, t.units_of
+    queue = list(cells)
+    dirty = set()
+    if mode == 'mac':
+        for cell in cells:
+            dirty.update(units_of[cell])
+    while queue or dirty:
+        while queue:
+            cell = queue.pop()
+            mark = len(trail)
+            forced = prune(domains, cell, domains[cell], trail, t)
+            if stats is not None:
+                stats.rule('prune', len(trail) - mark)
+            if forced is None:
+                return False
+            queue.extend(forced)
+            if mode == 'mac':
+                for entry in trail[mark:]:
+                    dirty.update(units_of[entry[0]])
+
+        if dirty:
+            mark = len(trail)
+            forced = hidden_singles(domains, units[dirty.pop()], trail, t)
+            if stats is not None:
+                stats.rule('hidden_singles', len(trail) - mark)
+            if forced is None:
+                return False
+            for cell in forced:
+                dirty.update(units_of[cell])
+            queue.extend(forced)
+    return True
+
+
+def select_mrv(domains, t=STANDARD):
+    popcount = t.popcount
+    best, fewest = None, t.side + 1
+    for cell, dom in enumerate(domains):
+        n = popcount[dom]
+        if 1 < n < fewest:
+            best, fewest = cell, n
+            if n == 2:
+                break
+    return best
+
+
+def solve(grid, domains, stats=None, mode='fc', budget=None, backjump=False):
+    """
+    Fills `grid` in place and returns True, or returns False when the
+    puzzle has no solution. `domains` comes from init_domains(grid).
+    All domain changes go on one trail stack and are undone back to the
+    mark taken before each guess. Any size from init_domains works.
+    Raises BudgetExhausted (grid untouched) if `budget` runs out first.
+    backjump=True searches with solve_backjumping() instead.
+    """
+    if backjump:
+        return solve_backjumping(grid, domains, stats, mode, budget)
+    t = tables(isqrt(len(grid)))
+    trail = []
+    start = [cell for cell, dom in enumerate(domains) if t.popcount[dom] == 1]
+    with phase(stats, 'propagate'):
+        if 0 in domains or not forward_check(domains, start, trail, mode, t, stats):
+            return False
+
+    def search(depth):
+        if stats is not None:
+            stats.nodes += 1
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+        if budget is not None:
+            budget.charge()
+
+        cell = select_mrv(domains, t)
+        if cell is None:
+            return True
+
+        dom = domains[cell]
+        while dom:
+            bit = dom & -dom
+            dom ^= bit
+
+            mark = len(trail)
+            trail.append((cell, domains[cell]))
+            domains[cell] = bit
+            if forward_check(domains, (cell,), trail, mode, t, stats) and search(depth + 1):
+                return True
+
+            # Backtrack
+            if stats is not None:
+                stats.backtracks += 1
+            undo(domains, trail, mark)
+
+        return False
+
+    with phase(stats, 'search'):
+        if not search(0):
+            return False
+
+    for cell, dom in enumerate(domains):
+        grid[cell // t.side][cell % t.side] = t.value_of[dom]
+    return True
+
+
+# Conflict-directed backjumping
+"""
+Search level d is bit 1 << d of a conflict set. conf[cell] holds the
+levels whose assignments (directly or through propagation) removed values
+from the cell's domain; a decided cell starts from its own level alone.
+Every narrowed cell takes on the conflict set of whatever narrowed it, so
+when a domain empties, its conflict set names the assignments to blame.
+Trail entries are (cell, domain, conflict set). These functions mirror
+prune, hidden_singles, undo and forward_check.
+"""
+def prune_explained(domains, conf, cell, bit, trail, t=STANDARD):
+    """
+    prune() keeping conflict sets. Returns the neighbours narrowed to one
+    value, or the conflict set (an int) of a domain that became empty.
+    """
+    popcount = t.popcount
+    reason = conf[cell]
+    forced = []
+    for n in t.neighbors[cell]:
+        dom = domains[n]
+        if dom & bit:
+            trail.append((n, dom, conf[n]))
+            dom &= ~bit
+            domains[n] = dom
+            conf[n] |= reason
+            if not dom:
+                return conf[n]
+            if popcount[dom] == 1:
+                forced.append(n)
+    return forced
+
+
+def undo_explained(domains, conf, trail, mark):
+    while len(trail) > mark:
+        cell, dom, conflict = trail.pop()
+        domains[cell] = dom
+        conf[cell] = conflict
+
+
+def hidden_singles_explained(domains, conf, unit, trail, t=STANDARD):
+    """
+    hidden_singles() keeping conflict sets. Whatever pins a value to one
+    cell of the unit is covered by the conflict sets of the unit's cells,
+    so their union is both the reason for a forced cell and the conflict
+    set of a failure. Returns the forced cells, or that conflict set.
+    """
+    once = twice = reason = 0
+    for cell in unit:
+        dom = domains[cell]
+        twice |= once & dom
+        once |= dom
+        reason |= conf[cell]
+    if once != t.full:
+        return reason
+
+    forced = []
+    singles = once & ~twice
+    if singles:
+        for cell in unit:
+            dom = domains[cell]
+            only = dom & singles
+            if only and only != dom:
+                if t.popcount[only] > 1:
+                    return reason
+                trail.append((cell, dom, conf[cell]))
+                domains[cell] = only
+                conf[cell] |= reason
+                forced.append(cell)
+    return forced
+
+
+def find_conflict(domains, conf, cells, trail, mode='fc', t=STANDARD, stats=None):
+    """
+    forward_check() keeping conflict sets. Returns None when propagation
+    succeeds, else the conflict set of the failure (0 if no search level
+    is to blame, i.e. the puzzle itself has no solution).
+    """
+    units, units_of = t.units, t.units_of
+    queue = list(cells)
+    dirty = set()
+    if mode == 'mac':
+        for cell in cells:
+            dirty.update(units_of[cell])
+    while queue or dirty:
+        while queue:
+            cell = queue.pop()
+            mark = len(trail)
+            forced = prune_explained(domains, conf, cell, domains[cell], trail, t)
+            if stats is not None:
+                stats.rule('prune', len(trail) - mark)
+            if forced.__class__ is int:
+                return forced
+            queue.extend(forced)
+            if mode == 'mac':
+                for entry in trail[mark:]:
+                    dirty.update(units_of[entry[0]])
+
+        if dirty:
+            mark = len(trail)
+            forced = hidden_singles_explained(domains, conf, units[dirty.pop()], trail, t)
+            if stats is not None:
+                stats.rule('hidden_singles', len(trail) - mark)
+            if forced.__class__ is int:
+                return forced
+            for cell in forced:
+                dirty.update(units_of[cell])
+            queue.extend(forced)
+    return None
+
+
+# Nogood store
+"""
+A nogood is a set of assignments, (cell, bit) pairs, that no solution
+contains: the decisions named by the conflict set of a failure. Only
+nogoods of at most `max_size` assignments are kept, and at most
+`capacity` of them, the oldest going first. Each is indexed under all
+of its assignments, so blocks() only looks at nogoods that mention the
+assignment about to be made.
+"""
+NOGOOD_CAPACITY = 1000
+NOGOOD_SIZE = 4
+
+class Nogoods:
+    def __init__(self, capacity=NOGOOD_CAPACITY, max_size=NOGOOD_SIZE):
+        self.capacity = capacity
+        self.max_size = max_size
+        self.order = deque()
+        self.watch = {}
+
+    def __len__(self):
+        return len(self.order)
+
+    def add(self, assignments):
+        if not 0 < len(assignments) <= self.max_size:
+            return
+        nogood = frozenset(assignments)
+        first = next(iter(nogood))
+        if nogood in self.watch.get(first, ()):
+            return
+        self.order.append(nogood)
+        for assignment in nogood:
+            self.watch.setdefault(assignment, []).append(nogood)
+        if len(self.order) > self.capacity:
+            old = self.order.popleft()
+            for assignment in old:
+                self.watch[assignment].remove(old)
+
+    def blocks(self, assignment, level):
+        """
+        `level` maps the current decisions to their search levels. Returns
+        the conflict set of a nogood that `assignment` would complete, or
+        None when it completes none.
+        """
+        for nogood in self.watch.get(assignment, ()):
+            conflict = 0
+            for other in nogood:
+                if other != assignment:
+                    depth = level.get(other)
+                    if depth is None:
+                        break
+                    conflict |= 1 << depth
+            else:
+                return conflict
+        return None
+
+
+def levels(conflict):
+    while conflict:
+        low = conflict & -conflict
+        yield low.bit_length() - 1
+        conflict ^= low
+
+
+def solve_backjumping(grid, domains, stats=None, mode='fc', budget=None, nogoods=NOGOOD_CAPACITY):
+    """
+    solve() with conflict-directed backjumping: a failed level returns
+    the conflict set of its failure, and every level not in it is undone
+    at once without trying its remaining values. The conflict sets of
+    failures are also kept as nogoods (at most `nogoods` of them, none
+    with nogoods=0) and values that would complete one are skipped.
+    Values skipped that way are counted as stats.rules['nogoods'].
+    """
+    t = tables(isqrt(len(grid)))
+    trail = []
+    conf = [0] * len(domains)
+    store = Nogoods(nogoods) if nogoods else None
+    decisions = []
+    level = {}
+    start = [cell for cell, dom in enumerate(domains) if t.popcount[dom] == 1]
+    with phase(stats, 'propagate'):
+        if 0 in domains or find_conflict(domains, conf, start, trail, mode, t, stats) is not None:
+            return False
+
+    def search(depth):
+        if stats is not None:
+            stats.nodes += 1
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+        if budget is not None:
+            budget.charge()
+
+        cell = select_mrv(domains, t)
+        if cell is None:
+            return True
+
+        here = 1 << depth
+        conflict = conf[cell]
+        dom = domains[cell]
+        while dom:
+            bit = dom & -dom
+            dom ^= bit
+
+            if store is not None:
+                blocked = store.blocks((cell, bit), level)
+                if blocked is not None:
+                    if stats is not None:
+                        stats.rule('nogoods', 1)
+                    conflict |= blocked
+                    continue
+
+            mark = len(trail)
+            trail.append((cell, domains[cell], conf[cell]))
+            domains[cell] = bit
+            conf[cell] = here
+            decisions.append((cell, bit))
+            level[cell, bit] = depth
+            failure = find_conflict(domains, conf, (cell,), trail, mode, t, stats)
+            if failure is None:
+                failure = search(depth + 1)
+                if failure is True:
+                    return True
+            if store is not None and failure & here:
+                store.add([decisions[d] for d in levels(failure)])
+            del level[decisions.pop()]
+
+            # Backtrack, or jump straight past this level
+            if stats is not None:
+                stats.backtracks += 1
+            undo_explained(domains, conf, trail, mark)
+            if not failure & here:
+                return failure
+            conflict |= failure & ~here
+
+        if store is not None:
+            store.add([decisions[d] for d in levels(conflict)])
+        return conflict
+
+    with phase(stats, 'search'):
+        if search(0) is not True:
+            return False
+
+    for cell, dom in enumerate(domains):
+        grid[cell // t.side][cell % t.side] = t.value_of[dom]
+    return True
+
+if __name__ == "__main__":
+
+    sudoku = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9]
+    ]
+
+    print("Initial Sudoku:")
+    print_grid(sudoku)
+
+    domains = init_domains(sudoku)
+
+    if solve(sudoku, domains):
+        print("Solved Sudoku:")
+        print_grid(sudoku)
+    else:
+        print("No solution found.")
\ No newline at end of file
@@ -0,0 +1,196 @@
+# Sudoku Puzzle Generator
+# Builds random complete grids, removes clues for as long as the puzzle
+# keeps a unique solution, and streams the puzzles to a file from a
+# process pool.
+#
+#   python -m sudoku_solver.generator 10000 puzzles.txt
+#   python -m sudoku_solver.generator 1000 puzzles.txt --clues 24 --seed 7
+
+import argparse
+import os
+import random
+import sys
+from collections import deque
+from multiprocessing import Pool
+
+from . import csp
+from .batch import chunked
+
+# -----------------------------
+# complete grids
+# -----------------------------
+"""
+The boxes on the diagonal share no row or column, so each of them can be
+filled with its own random permutation; the CSP search then completes the
+grid. For n >= 3 it always can, but some seedings of a 4x4 grid (n=2)
+have no completion, so the seeding is drawn again until one does.
+"""
+def random_grid(rng, n=3):
+    t = csp.tables(n)
+    side = n * n
+    while True:
+        masks = [t.full] * (side * side)
+        for b in range(n):
+            box = t.units[2 * side + b * (n + 1)]
+            for cell, k in zip(box, rng.sample(range(side), side)):
+                masks[cell] = 1 << k
+        grid = csp.search(masks, t=t)
+        if grid is not False:
+            return grid
+
+# -----------------------------
+# uniqueness check
+# -----------------------------
+"""
+The solution is known, so there is no need to count solutions after a
+clue is removed: the puzzle stays unique exactly when no solution puts
+a different digit in the freed cells. Each check forbids the removed
+digit and asks the search for a contradiction, which propagation usually
+finds at once.
+
+For a group of cells, solution k differs from the known one first at
+group[k]: the earlier cells keep their digit, group[k] loses its digit
+and the later cells are free.
+"""
+def removable(masks, solution, group, t=csp.STANDARD):
+    for k, cell in enumerate(group):
+        trial = masks.copy()
+        for earlier in group[:k]:
+            trial[earlier] = solution[earlier]
+        for later in group[k + 1:]:
+            trial[later] = t.full
+        trial[cell] = t.full & ~solution[cell]
+        if csp.search(trial, t=t) is not False:
+            return False
+    return True
+
+
+"""
+One pass over the clues in random order removes every clue (or, with
+symmetric=True, every pair of clues mirrored through the centre) whose
+removal keeps the solution unique. A clue that is needed stays needed
+once others are gone, so a single pass leaves a minimal puzzle. The pass
+stops early once only `clues` clues are left. Symmetric puzzles are
+usually not minimal; minimal=True finishes them with a single-clue pass.
+"""
+def remove_clues(solution, rng, clues=None, symmetric=False, minimal=False, t=csp.STANDARD):
+    masks = list(solution)
+    count = len(masks)
+    last = count - 1
+
+    passes = [True, False] if symmetric and minimal else [symmetric]
+    for paired in passes:
+        cells = list(range(len(masks)))
+        rng.shuffle(cells)
+        for cell in cells:
+            if clues is not None and count <= clues:
+                return masks
+            if masks[cell] == t.full:
+                continue
+            group = (cell, last - cell) if paired and cell != last - cell else (cell,)
+            if clues is not None and count - len(group) < clues:
+                continue
+            if removable(masks, solution, group, t):
+                for c in group:
+                    masks[c] = t.full
+                count -= len(group)
+    return masks
+
+
+"""
+Returns a puzzle string ('.' for empty cells) with a unique solution, or
+None when `attempts` grids in a row could not be brought down to `clues`
+clues. Without a target every grid succeeds at the first attempt.
+"""
+def generate(rng=None, clues=None, symmetric=False, minimal=False, attempts=100, n=3):
+    rng = rng or random.Random()
+    t = csp.tables(n)
+    for _ in range(attempts):
+        solution = random_grid(rng, n)
+        masks = remove_clues(solution, rng, clues, symmetric, minimal, t)
+        given = sum(m != t.full for m in masks)
+        if clues is None or given <= clues:
+            return ''.join(t.digit.get(m, '.') for m in masks)
+    return None
+
+# -----------------------------
+# worker side
+# -----------------------------
+def generate_chunk(seed, size, options):
+    rng = random.Random(seed)
+    puzzles = []
+    for _ in range(size):
+        puzzle = generate(rng, **options)
+        if puzzle is not None:
+            puzzles.append(puzzle)
+    return puzzles
+
+# -----------------------------
+# parallel driver
+# -----------------------------
+"""
+Same pool layout as batch.solve_stream: at most `processes * max_pending`
+chunks are in flight, and each chunk draws its own seed from `seed`, so a
+fixed seed reproduces the same file whatever the number of processes.
+Puzzles that miss an unreachable clue target are dropped, so fewer than
+`count` may come out.
+"""
+def generate_stream(count, processes=None, chunk_size=100, max_pending=2, seed=None, **options):
+    processes = processes or os.cpu_count() or 1
+    master = random.Random(seed)
+    jobs = ((master.getrandbits(64), len(chunk)) for chunk in chunked(range(count), chunk_size))
+
+    if processes == 1:
+        for chunk_seed, size in jobs:
+            yield from generate_chunk(chunk_seed, size, options)
+        return
+
+    limit = processes * max_pending
+    with Pool(processes) as pool:
+        pending = deque()
+        for chunk_seed, size in jobs:
+            pending.append(pool.apply_async(generate_chunk, (chunk_seed, size, options)))
+            if len(pending) >= limit:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def generate_file(output_path, count, processes=None, chunk_size=100, seed=None, **options):
+    written = 0
+    with open(output_path, 'w') as dst:
+        for puzzle in generate_stream(count, processes, chunk_size, seed=seed, **options):
+            dst.write(puzzle + '\n')
+            written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Sudoku puzzles with unique solutions.")
+    parser.add_argument("count", type=int, help="number of puzzles to generate")
+    parser.add_argument("output", help="file to write one 81-character puzzle per line")
+    parser.add_argument("--clues", type=int, default=None,
+                        help="stop removing clues at this many (default: as few as possible)")
+    parser.add_argument("--symmetric", action="store_true",
+                        help="keep the clues symmetric about the centre")
+    parser.add_argument("--minimal", action="store_true",
+                        help="with --symmetric, finish with a pass that makes every clue necessary")
+    parser.add_argument("--attempts", type=int, default=100,
+                        help="grids to try per puzzle before giving up on --clues")
+    parser.add_argument("-n", "--box-side", type=int, default=3,
+                        help="box side: 3 for 9x9 (default), 4 for 16x16")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=100,
+                        help="puzzles generated by a worker at a time")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    args = parser.parse_args(argv)
+
+    count = generate_file(args.output, args.count, args.processes, args.chunk_size, args.seed,
+                          clues=args.clues, symmetric=args.symmetric, minimal=args.minimal,
+                          attempts=args.attempts, n=args.box_side)
+    print("generated %d puzzles" % count, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
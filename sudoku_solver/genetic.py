@@ -0,0 +1,298 @@
+import os
+import sys
+import time
+import numpy as np
+
+from .stats import phase
+# The population is a (P, 9, 9) array of chromosomes. Every row of a
+# chromosome is a permutation of 1..9 that keeps the puzzle's givens, so
+# only column and box clashes count against fitness.
+EMPTY = np.zeros((9, 9), dtype=np.int8)
+def rowPlan(initial):
+    """For each row: the free positions and the digits missing from it."""
+    plan = []
+    for row in np.asarray(initial, dtype=np.int8):
+        free = np.flatnonzero(row == 0)
+        missing = np.setdiff1d(np.arange(1, 10, dtype=np.int8), row)
+        plan.append((free, missing))
+    return plan
+def fillRows(population, rows, r, plan, rng):
+    # give population[rows, r] fresh random permutations that keep the givens
+    free, missing = plan[r]
+    if len(rows) and len(free):
+        order = np.argsort(rng.random((len(rows), len(free))), axis=1)
+        population[rows[:, None], r, free] = missing[order]
+def createGene(initial=None, rng=None):
+    rng = rng or np.random.default_rng()
+    row = np.array(initial if initial is not None else [0] * 9, dtype=np.int8)
+    free = np.flatnonzero(row == 0)
+    row[free] = rng.permutation(np.setdiff1d(np.arange(1, 10, dtype=np.int8), row))
+    return row
+def createChromosome(initial=None, rng=None):
+    return createPopulation(1, initial, rng)[0]
+def createPopulation(count, initial=None, rng=None, plan=None):
+    rng = rng or np.random.default_rng()
+    initial = EMPTY if initial is None else np.asarray(initial, dtype=np.int8)
+    plan = plan or rowPlan(initial)
+    population = np.repeat(initial[None], count, axis=0)
+    everyone = np.arange(count)
+    for r in range(9):
+        fillRows(population, everyone, r, plan, rng)
+    return population
+def boxes(population):
+    # (P, 9, 9) grids -> (P, 9, 9) with one 3x3 box per row
+    p = population.shape[0]
+    return population.reshape(p, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(p, 9, 9)
+def fitness(population):
+    """Fitness of every chromosome at once: minus the repeated digits in
+    columns and 3x3 squares (0 for a solved grid)."""
+    cols = np.sort(population, axis=1)
+    squares = np.sort(boxes(population), axis=2)
+    repeats = (cols[:, 1:, :] == cols[:, :-1, :]).sum(axis=(1, 2))
+    repeats += (squares[:, :, 1:] == squares[:, :, :-1]).sum(axis=(1, 2))
+    return -repeats
+def fitnessf(chromosome):
+    """Calculate the fitness of a chromosome (puzzle)."""
+    return int(fitness(np.asarray(chromosome)[None])[0])
+
+
+def layout(ch):
+    for i in range(9):
+        for j in range(9):
+            print(ch[i][j], end=" ")
+        print("")
+
+def crossover(ch1, ch2, swap):
+    # swap is a boolean mask over rows (one row per pair in a batch)
+    new_child_1 = np.where(swap[..., None], ch2, ch1)
+    new_child_2 = np.where(swap[..., None], ch1, ch2)
+    return new_child_1, new_child_2
+def mutation(population, pm, plan, rng):
+    # every row of every chromosome is regenerated with probability pm
+    mutate = rng.random((population.shape[0], 9)) < pm
+    for r in range(9):
+        fillRows(population, np.flatnonzero(mutate[:, r]), r, plan, rng)
+    return population
+def readPuzzle(address):
+    puzzle = []
+    with open(address, 'r') as f:
+        for row in f:
+            temp = row.split()
+            if temp:
+                puzzle.append([int(c) for c in temp])
+    return puzzle
+#similar to wheel selection but probabilities are not direct indicates of fitness (rank selection)
+def rankMatingPool(population, fit, rng):
+    count = population.shape[0]
+    weight = np.empty(count)
+    weight[np.argsort(fit, kind='stable')] = np.arange(1, count + 1)
+    # draws are independent, so the pool is already in random order
+    return population[rng.choice(count, size=count, p=weight / weight.sum())]
+
+def offsprings(population, plan, pm, pc, rng):
+    count = population.shape[0]
+    first = np.arange(0, count, 2)
+    ch1 = population[first]
+    ch2 = population[(first + 1) % count]
+    cross = rng.random(len(first)) < pc
+    swap = (rng.random((len(first), 9)) < 0.5) & cross[:, None]
+    ch1, ch2 = crossover(ch1, ch2, swap)
+    new_pool = np.empty_like(population, shape=(2 * len(first), 9, 9))
+    new_pool[0::2] = ch1
+    new_pool[1::2] = ch2
+    return mutation(new_pool[:count], pm, plan, rng)
+# Population size
+POPULATION = 1000
+
+# Number of generations
+REPETITION = 1000
+
+# Probability of mutation
+PM = 0.1
+
+# Probability of crossover
+PC = 0.95
+# One generation: rank selection, crossover and mutation. Returns the new
+# population with its fitness, which is computed exactly once.
+def nextGeneration(population, fit, plan, rng, pm=PM, pc=PC):
+    mating_pool = rankMatingPool(population, fit, rng)
+    population = offsprings(mating_pool, plan, pm, pc, rng)
+    return population, fitness(population)
+# Main genetic algorithm function
+# initial is either a puzzle file path or a 9x9 grid
+# with stats: generations, best_score (fewest clashes) and "generation"
+# callback events, and "init"/"evolve" phase timers
+# with a budget (see budget.py): one node per generation; when it runs out
+# the best chromosome seen so far is put back into the returned population
+def genetic_algorithm(initial, stats=None, seed=None, budget=None):
+    if isinstance(initial, str):
+        initial = readPuzzle(initial)
+    rng = np.random.default_rng(seed)
+    with phase(stats, 'init'):
+        plan = rowPlan(initial)
+        population = createPopulation(POPULATION, initial, rng, plan)
+        fit = fitness(population)
+    best = population[fit.argmax()].copy(), int(fit.max())
+    with phase(stats, 'evolve'):
+        for generation in range(REPETITION):
+            if budget is not None and not budget.spend():
+                population[fit.argmin()] = best[0]
+                return population
+            population, fit = nextGeneration(population, fit, plan, rng)
+            if budget is not None and fit.max() > best[1]:
+                best = population[fit.argmax()].copy(), int(fit.max())
+            if stats is not None:
+                stats.nodes += 1
+                stats.generations += 1
+                stats.score(-int(fit.max()))
+                if stats.callbacks:
+                    stats.emit('generation', generation=generation + 1, best=-int(fit.max()),
+                               mean=-float(fit.mean()))
+            if fit.max() == 0:
+                return population
+    return population
+# -----------------------------
+# island model
+# -----------------------------
+# Each island evolves its own sub-population in a worker process. Every
+# `interval` generations it sends copies of its best chromosomes to the
+# islands its topology points at, and replaces its worst chromosomes with
+# whatever has arrived in its inbox. The first island to reach fitness 0
+# sets the shared stop event and every island returns at its next
+# generation.
+TOPOLOGIES = ('ring', 'full', 'random')
+def migrationTargets(index, islands, topology):
+    if topology == 'ring':
+        return [(index + 1) % islands]
+    if topology == 'full':
+        return [i for i in range(islands) if i != index]
+    if topology == 'random':
+        return None  # picked again at every migration
+    raise ValueError("unknown topology %r (choose from %s)" % (topology, ', '.join(TOPOLOGIES)))
+def islandWorker(index, initial, size, generations, interval, migrants, targets,
+                 inboxes, stop, results, seed, pm=PM, pc=PC, deadline=None):
+    import queue
+    rng = np.random.default_rng(seed)
+    plan = rowPlan(initial)
+    population = createPopulation(size, initial, rng, plan)
+    fit = fitness(population)
+    top = population[fit.argmax()].copy(), int(fit.max())
+    done = 0
+    try:
+        while done < generations and fit.max() < 0 and not stop.is_set():
+            if deadline is not None and time.time() > deadline:
+                break
+            population, fit = nextGeneration(population, fit, plan, rng, pm, pc)
+            done += 1
+            if fit.max() > top[1]:
+                top = population[fit.argmax()].copy(), int(fit.max())
+            if fit.max() == 0:
+                stop.set()
+                break
+            if done % interval == 0:
+                best = population[np.argsort(fit)[-migrants:]]
+                for target in targets or [rng.choice([i for i in range(len(inboxes)) if i != index])]:
+                    try:
+                        inboxes[target].put_nowait(best)
+                    except queue.Full:
+                        pass
+                while True:
+                    try:
+                        immigrants = inboxes[index].get_nowait()
+                    except queue.Empty:
+                        break
+                    worst = np.argsort(fit)[:len(immigrants)]
+                    population[worst] = immigrants
+                    fit[worst] = fitness(immigrants)
+    finally:
+        results.put((index, top[0], top[1], done))
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+"""
+Runs `islands` sub-populations (default: one per core) of `size`
+chromosomes each (default: POPULATION) and returns (best chromosome, its fitness). Stops as
+soon as any island solves the puzzle or every island has run
+`generations` generations. A budget caps each island at its share of the
+node budget (one node per generation) and at the deadline; each island
+reports the best chromosome it has seen. Raises ValueError when called
+from a daemonic process (a batch pool or benchmark worker).
+"""
+def island_genetic_algorithm(initial, islands=None, size=None, generations=REPETITION,
+                             interval=20, migrants=5, topology='ring', seed=None, stats=None,
+                             budget=None):
+    import multiprocessing
+    if multiprocessing.current_process().daemon:
+        raise ValueError("the island model starts worker processes and cannot run in a daemonic process")
+    if isinstance(initial, str):
+        initial = readPuzzle(initial)
+    initial = np.asarray(initial, dtype=np.int8)
+    islands = islands or os.cpu_count() or 1
+    size = size or POPULATION
+    migrants = min(migrants, size)
+    if islands < 2 and topology == 'random':
+        topology = 'ring'
+    deadline = None
+    limit = generations
+    if budget is not None:
+        seconds = budget.remaining_seconds()
+        deadline = None if seconds is None else time.time() + seconds
+        if budget.nodes is not None:
+            limit = min(generations, budget.remaining_nodes() // islands)
+
+    ctx = multiprocessing.get_context()
+    inboxes = [ctx.Queue(maxsize=4 * islands) for _ in range(islands)]
+    results = ctx.Queue()
+    stop = ctx.Event()
+    seeds = np.random.SeedSequence(seed).spawn(islands)
+    workers = [
+        ctx.Process(target=islandWorker, daemon=True,
+                    args=(i, initial, size, limit, interval, migrants,
+                          migrationTargets(i, islands, topology), inboxes, stop, results, seeds[i]),
+                    kwargs={'deadline': deadline})
+        for i in range(islands)
+    ]
+    for w in workers:
+        w.start()
+
+    outcome = []
+    try:
+        while len(outcome) < islands:
+            try:
+                outcome.append(results.get(timeout=1))
+            except Exception:
+                if not any(w.is_alive() for w in workers) and results.empty():
+                    break
+    finally:
+        stop.set()
+        for w in workers:
+            w.join(timeout=5)
+            if w.is_alive():
+                w.terminate()
+
+    if not outcome:
+        raise RuntimeError("all islands exited without a result")
+    _, best, best_fit, _ = max(outcome, key=lambda o: o[2])
+    if stats is not None:
+        stats.nodes += sum(done for _, _, _, done in outcome)
+        stats.generations += sum(done for _, _, _, done in outcome)
+        stats.score(-best_fit)
+    if budget is not None:
+        spent = [done for _, _, _, done in outcome]
+        budget.spend(sum(spent))
+        if best_fit < 0 and limit < generations and min(spent) >= limit:
+            budget.reason = budget.reason or 'nodes'
+    return best, best_fit
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        puzzle_file = sys.argv[1]
+    else:
+        puzzle_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "new 2.txt")
+    tic = time.time()
+    r = genetic_algorithm(puzzle_file)
+    toc = time.time()
+    print("time_taken: ", toc - tic)
+    fit = fitness(r)
+    print(fit.max())
+
+    # Print the chromosome with the highest fitness
+    layout(r[fit.argmax()])
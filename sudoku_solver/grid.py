@@ -0,0 +1,154 @@
+# Grid conversions shared by the solvers
+# The solvers take puzzles in different shapes (9x9 lists, 81-character
+# strings, numpy arrays); these helpers move between them.
+
+from collections import namedtuple
+from functools import lru_cache
+from math import isqrt
+
+N = 9
+EMPTY = '.0'
+
+# Digits 1..25 as single characters: 9x9 puzzles use 1-9, 16x16 puzzles
+# 1-9A-G and 25x25 puzzles 1-9A-P.
+SYMBOLS = '123456789ABCDEFGHIJKLMNOP'
+
+# -----------------------------
+# board sizes
+# -----------------------------
+# A board with box side n is n*n cells wide and has n**4 cells.
+def box_side(cells):
+    n = isqrt(isqrt(cells))
+    if n ** 4 != cells or not 2 <= n <= 5:
+        raise ValueError("%d cells is not a 4x4, 9x9, 16x16 or 25x25 grid" % cells)
+    return n
+
+
+"""
+Index tables for a board with box side n, built once per size. Cell
+r * side + c is row r, column c.
+
+units    → the rows, then the columns, then the boxes, as cell tuples
+units_of → the indices of the 3 units containing each cell
+peers    → the other cells sharing a unit with each cell (sorted)
+"""
+Geometry = namedtuple('Geometry', 'n side cells units units_of peers')
+
+@lru_cache(maxsize=None)
+def geometry(n):
+    side = n * n
+    units = (
+        [tuple(r * side + c for c in range(side)) for r in range(side)]
+        + [tuple(r * side + c for r in range(side)) for c in range(side)]
+        + [tuple((br + i) * side + bc + j for i in range(n) for j in range(n))
+           for br in range(0, side, n) for bc in range(0, side, n)]
+    )
+    units_of = [[] for _ in range(side * side)]
+    for u, unit in enumerate(units):
+        for cell in unit:
+            units_of[cell].append(u)
+    peers = [
+        tuple(sorted(set().union(*(units[u] for u in units_of[cell])) - {cell}))
+        for cell in range(side * side)
+    ]
+    return Geometry(n, side, side * side, tuple(units),
+                    tuple(map(tuple, units_of)), tuple(peers))
+
+
+"""
+popcounts(bits)[m] is the number of set bits in m, for masks up to `bits`
+wide. Up to 17 bits (16x16 boards) this is a lookup table; wider masks
+are counted on the fly instead of building a table with 2**26 entries.
+"""
+class WidePopcount:
+    def __getitem__(self, m):
+        return bin(m).count('1')
+
+
+@lru_cache(maxsize=None)
+def popcounts(bits):
+    if bits > 17:
+        return WidePopcount()
+    return [bin(m).count('1') for m in range(1 << bits)]
+
+# -----------------------------
+# puzzle -> list of ints
+# -----------------------------
+"""
+Accepts a string of n**4 characters ('.' or '0' for empty cells, digits
+from SYMBOLS otherwise) or any square sequence of ints (lists, tuples,
+numpy arrays), and always returns a fresh list of lists that the caller
+may modify. 9x9 is the usual size; 4x4, 16x16 and 25x25 also work.
+A character or value that is not a digit of the grid raises ValueError
+naming its position.
+"""
+def to_board(puzzle):
+    if isinstance(puzzle, str):
+        cells = [c for c in puzzle if not c.isspace()]
+        side = box_side(len(cells)) ** 2
+        values = []
+        for i, c in enumerate(cells):
+            v = 0 if c in EMPTY else SYMBOLS.find(c.upper()) + 1
+            if v > side or (v == 0 and c not in EMPTY):
+                raise ValueError("invalid character %r at position %d of a %dx%d puzzle"
+                                 % (c, i + 1, side, side))
+            values.append(v)
+        return [values[r * side:(r + 1) * side] for r in range(side)]
+
+    board = [[int(v) for v in row] for row in puzzle]
+    side = box_side(len(board) ** 2) ** 2
+    if any(len(row) != side for row in board):
+        raise ValueError("expected a %dx%d grid" % (side, side))
+    for r, row in enumerate(board):
+        for c, v in enumerate(row):
+            if not 0 <= v <= side:
+                raise ValueError("cell (%d, %d) holds %d, outside 0..%d" % (r, c, v, side))
+    return board
+
+# -----------------------------
+# board -> string, one character per cell
+# -----------------------------
+def to_string(board, empty='.'):
+    return ''.join(SYMBOLS[v - 1] if v else empty for row in board for v in row)
+
+# -----------------------------
+# 81 cells <-> 41 packed bytes
+# -----------------------------
+# Two cells per byte, 4 bits each (high nibble first); the last byte holds
+# cell 80 in its high nibble.
+PACKED_SIZE = (N * N + 1) // 2
+
+def pack_cells(cells):
+    cells = list(cells) + [0]
+    return bytes((cells[i] << 4) | cells[i + 1] for i in range(0, N * N, 2))
+
+def unpack_cells(data):
+    cells = []
+    for byte in data:
+        cells.append(byte >> 4)
+        cells.append(byte & 15)
+    del cells[N * N:]
+    return cells
+
+# -----------------------------
+# check a completed board
+# -----------------------------
+def is_solution(board, puzzle=None):
+    side = len(board)
+    full = set(range(1, side + 1))
+    cells = [v for row in board for v in row]
+    if len(cells) != side * side:
+        return False
+    for unit in geometry(box_side(len(cells))).units:
+        if {cells[i] for i in unit} != full:
+            return False
+
+    if puzzle is not None:
+        given = to_board(puzzle)
+        if len(given) != side:
+            return False
+        for r in range(side):
+            for c in range(side):
+                if given[r][c] and given[r][c] != board[r][c]:
+                    return False
+    return True
@@ -0,0 +1,273 @@
+import random
+import copy
+import time
+
+N = 9
+
+# -------------------------------------------------
+# Count conflicts (heuristic function)
+# -------------------------------------------------
+def get_conflicts(grid):
+    conflicts = 0
+
+    # Column conflicts
+    for col in range(N):
+        seen = set()
+        for row in range(N):
+            val = grid[row][col]
+            if val in seen:
+                conflicts += 1
+            else:
+                seen.add(val)
+
+    # 3x3 subgrid conflicts
+    for box_row in range(0, N, 3):
+        for box_col in range(0, N, 3):
+            seen = set()
+            for i in range(3):
+                for j in range(3):
+                    val = grid[box_row + i][box_col + j]
+                    if val in seen:
+                        conflicts += 1
+                    else:
+                        seen.add(val)
+
+    return conflicts
+
+
+# -------------------------------------------------
+# Generate initial complete state (rows are valid)
+# -------------------------------------------------
+def generate_initial_state(grid, fixed, rng=random):
+    new_grid = copy.deepcopy(grid)
+
+    for row in range(N):
+        missing = [x for x in range(1, 10) if x not in new_grid[row]]
+        rng.shuffle(missing)
+
+        for col in range(N):
+            if not fixed[row][col]:
+                new_grid[row][col] = missing.pop()
+
+    return new_grid
+
+
+# -------------------------------------------------
+# Column / box digit counts
+# -------------------------------------------------
+# col_counts[c][v] and box_counts[b][v] count digit v in column c and box b.
+# Rows never conflict (moves only swap inside a row), so the conflicts of
+# a grid are the repeats recorded in these two tables.
+BOX_OF = [[(r // 3) * 3 + c // 3 for c in range(N)] for r in range(N)]
+
+def count_tables(grid):
+    col_counts = [[0] * (N + 1) for _ in range(N)]
+    box_counts = [[0] * (N + 1) for _ in range(N)]
+    for r in range(N):
+        for c in range(N):
+            v = grid[r][c]
+            col_counts[c][v] += 1
+            box_counts[BOX_OF[r][c]][v] += 1
+    return col_counts, box_counts
+
+
+# -------------------------------------------------
+# Conflict change of one in-row swap, in O(1)
+# -------------------------------------------------
+def swap_delta(col_counts, box_counts, row, c1, c2, v1, v2):
+    # column c1 trades v1 for v2, column c2 trades v2 for v1
+    delta = ((col_counts[c1][v2] > 0) - (col_counts[c1][v1] > 1)
+             + (col_counts[c2][v1] > 0) - (col_counts[c2][v2] > 1))
+    b1, b2 = BOX_OF[row][c1], BOX_OF[row][c2]
+    if b1 != b2:
+        delta += ((box_counts[b1][v2] > 0) - (box_counts[b1][v1] > 1)
+                  + (box_counts[b2][v1] > 0) - (box_counts[b2][v2] > 1))
+    return delta
+
+
+def apply_swap(grid, col_counts, box_counts, row, c1, c2):
+    v1, v2 = grid[row][c1], grid[row][c2]
+    grid[row][c1], grid[row][c2] = v2, v1
+    b1, b2 = BOX_OF[row][c1], BOX_OF[row][c2]
+    col_counts[c1][v1] -= 1
+    col_counts[c1][v2] += 1
+    col_counts[c2][v2] -= 1
+    col_counts[c2][v1] += 1
+    box_counts[b1][v1] -= 1
+    box_counts[b1][v2] += 1
+    box_counts[b2][v2] -= 1
+    box_counts[b2][v1] += 1
+
+
+# -------------------------------------------------
+# All swaps inside rows (the neighbourhood)
+# -------------------------------------------------
+def get_moves(fixed):
+    moves = []
+
+    for row in range(N):
+        free_cells = [c for c in range(N) if not fixed[row][c]]
+
+        for i in range(len(free_cells)):
+            for j in range(i + 1, len(free_cells)):
+                moves.append((row, free_cells[i], free_cells[j]))
+
+    return moves
+
+
+# -------------------------------------------------
+# Hill Climbing Algorithm
+# -------------------------------------------------
+"""
+mode="best"  → take the swap with the largest conflict reduction
+mode="first" → scan swaps in random order and take the first improving one
+
+When no swap improves, up to `max_sideways` consecutive swaps that keep
+the conflict count unchanged are allowed before giving up at the local
+optimum. Returns (grid, conflicts). A budget (see budget.py) is spent
+one node per iteration; when it runs out the climb stops where it is,
+which is also the best grid it has seen.
+"""
+def hill_climbing_sudoku(grid, stats=None, mode='best', max_sideways=100, seed=None, budget=None):
+    if mode not in ('best', 'first'):
+        raise ValueError("mode must be 'best' or 'first'")
+    rng = random.Random(seed)
+    fixed = [[cell != 0 for cell in row] for row in grid]
+
+    current = generate_initial_state(grid, fixed, rng)
+    col_counts, box_counts = count_tables(current)
+    current_h = get_conflicts(current)
+    moves = get_moves(fixed)
+    sideways = 0
+
+    while current_h > 0:
+        if stats is not None:
+            stats.nodes += 1
+        if budget is not None and not budget.spend():
+            break
+
+        chosen, chosen_delta = None, 1
+        if mode == 'first':
+            rng.shuffle(moves)
+        for move in moves:
+            row, c1, c2 = move
+            delta = swap_delta(col_counts, box_counts, row, c1, c2,
+                               current[row][c1], current[row][c2])
+            if delta < chosen_delta or (delta == chosen_delta == 0 and rng.random() < 0.5):
+                chosen, chosen_delta = move, delta
+                if mode == 'first' and delta < 0:
+                    break
+
+        if chosen is None or chosen_delta > 0:
+            break  # Local optimum reached
+        if chosen_delta == 0:
+            if sideways >= max_sideways:
+                break  # Plateau, out of sideways moves
+            sideways += 1
+        else:
+            sideways = 0
+
+        apply_swap(current, col_counts, box_counts, *chosen)
+        current_h += chosen_delta
+
+    if stats is not None:
+        stats.score(current_h)
+    return current, current_h
+
+
+# -------------------------------------------------
+# Parallel random restarts
+# -------------------------------------------------
+def _climb(args):
+    grid, mode, max_sideways, seed, counted, deadline = args
+    budget = None
+    if deadline is not None:
+        from .budget import Budget
+        budget = Budget(seconds=deadline - time.time())
+    if not counted:
+        return hill_climbing_sudoku(grid, None, mode, max_sideways, seed, budget) + (0,)
+    from .stats import SearchStats
+    stats = SearchStats()
+    current, h = hill_climbing_sudoku(grid, stats, mode, max_sideways, seed, budget)
+    return current, h, stats.nodes
+
+
+"""
+Runs up to `restarts` independent climbs on a process pool and returns
+the first zero-conflict (grid, 0) as soon as one arrives, cancelling the
+rest. Otherwise returns the result with the fewest conflicts. With stats,
+each finished climb counts as a restart (and a "restart" callback event)
+and its iterations are added to the nodes.
+
+With a budget, each climb stops at the budget's deadline, and the nodes
+of finished climbs are spent from it; no new results are taken once it
+runs out, and the best result so far is returned.
+
+Inside a daemonic process (a batch pool, benchmark or portfolio worker),
+which may not start a pool, the climbs run one after another.
+"""
+def random_restarts(grid, restarts=100, processes=None, mode='best', max_sideways=100, seed=None,
+                    stats=None, budget=None):
+    from multiprocessing import Pool, current_process
+
+    seeds = random.Random(seed)
+    counted = stats is not None or budget is not None
+    seconds = None if budget is None else budget.remaining_seconds()
+    deadline = None if seconds is None else time.time() + seconds
+    jobs = ((grid, mode, max_sideways, seeds.getrandbits(64), counted, deadline) for _ in range(restarts))
+    best = None
+
+    if processes == 1 or current_process().daemon:
+        results = map(_climb, jobs)
+        pool = None
+    else:
+        pool = Pool(processes)
+        results = pool.imap_unordered(_climb, jobs)
+    try:
+        for current, h, nodes in results:
+            if stats is not None:
+                stats.restarts += 1
+                stats.nodes += nodes
+                stats.score(h)
+                if stats.callbacks:
+                    stats.emit('restart', conflicts=h)
+            if best is None or h < best[1]:
+                best = (current, h)
+            if h == 0:
+                break
+            if budget is not None and not budget.spend(nodes):
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    return best
+
+if __name__ == "__main__":
+    # -------------------------------------------------
+    # INPUT SUDOKU 
+    # -------------------------------------------------
+    grid = [
+        [5, 3, 0, 0, 7, 0, 0, 0, 0],
+        [6, 0, 0, 1, 9, 5, 0, 0, 0],
+        [0, 9, 8, 0, 0, 0, 0, 6, 0],
+
+        [8, 0, 0, 0, 6, 0, 0, 0, 3],
+        [4, 0, 0, 8, 0, 3, 0, 0, 1],
+        [7, 0, 0, 0, 2, 0, 0, 0, 6],
+
+        [0, 6, 0, 0, 0, 0, 2, 8, 0],
+        [0, 0, 0, 4, 1, 9, 0, 0, 5],
+        [0, 0, 0, 0, 8, 0, 0, 7, 9]
+    ]
+
+    # -------------------------------------------------
+    # RUN SOLVER
+    # -------------------------------------------------
+    solution, h = hill_climbing_sudoku(grid)
+
+    print("Final heuristic value (conflicts):", h)
+    print("Final Sudoku State:")
+    for row in solution:
+        print(row)
@@ -0,0 +1,175 @@
+# Portfolio solver
+# Races several solvers on the same puzzle, each in its own process, keeps
+# the first verified solution and kills the rest. Wins are counted (and
+# optionally logged) so that later runs can favour the methods that win.
+#
+#   python -m sudoku_solver.portfolio 53..7....6..195... -m csp dlx annealing
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from multiprocessing.connection import wait
+
+from . import METHODS, NESTED, is_solution, solve, to_board, to_string
+from .stats import SearchStats
+
+DEFAULT_METHODS = ('csp', 'dlx', 'mac', 'annealing')
+
+# methods that prove "no solution" when they return None; the local
+# searches can also give up on solvable puzzles
+COMPLETE = {'csp', 'dlx', 'forward_checking', 'mac', 'forward_checking_cbj', 'backtracking', 'astar',
+            'ida_star', 'bfs'}
+
+# -----------------------------
+# one contestant (child process)
+# -----------------------------
+def _run(conn, board, method):
+    stats = SearchStats()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            message = ('ok', solve(board, method, stats), stats.as_dict())
+        except Exception as exc:
+            message = ('error', '%s: %s' % (type(exc).__name__, exc), None)
+    conn.send(message)
+    conn.close()
+
+# -----------------------------
+# race
+# -----------------------------
+"""
+Returns a dict with
+
+  status    → solved, unsolvable (a complete method found no solution),
+              failed (every method gave up) or timeout
+  board     → the solution as a list of lists, or None
+  winner    → the method that decided the race, or None
+  wall_time → seconds until the race was decided
+  outcomes  → what each method that finished reported
+
+A solution only wins after is_solution() has checked it against the
+puzzle. The losers are terminated as soon as the race is decided. If
+`stats` is given, the winner's node and backtrack counts are added to it.
+"""
+def race(puzzle, methods=DEFAULT_METHODS, timeout=None, stats=None):
+    board = to_board(puzzle)
+    for method in methods:
+        if method not in METHODS:
+            raise ValueError("unknown method %r" % method)
+        if method in NESTED:
+            raise ValueError("method %r runs its own processes and cannot race" % method)
+
+    ctx = multiprocessing.get_context()
+    start = time.perf_counter()
+    runners = {}
+    for method in methods:
+        recv, send = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_run, args=(send, board, method), daemon=True)
+        proc.start()
+        send.close()
+        runners[recv] = (method, proc)
+
+    result = {'status': 'timeout', 'board': None, 'winner': None, 'outcomes': {}}
+    try:
+        while runners:
+            remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+            if remaining is not None and remaining <= 0:
+                break
+            ready = wait(list(runners), remaining)
+            if not ready:
+                break
+            for conn in ready:
+                method, proc = runners.pop(conn)
+                try:
+                    status, answer, counts = conn.recv()
+                except EOFError:
+                    status, answer, counts = 'error', 'worker exited with code %s' % proc.exitcode, None
+                conn.close()
+
+                if status == 'error':
+                    outcome = 'error'
+                elif answer and is_solution(answer, board):
+                    outcome = 'solved'
+                elif answer is None and method in COMPLETE:
+                    outcome = 'unsolvable'
+                else:
+                    outcome = 'failed'
+                result['outcomes'][method] = outcome
+
+                if outcome in ('solved', 'unsolvable'):
+                    result.update(status=outcome, board=answer, winner=method)
+                    if stats is not None:
+                        stats.nodes += counts['nodes']
+                        stats.backtracks += counts['backtracks']
+                    return result
+        if not runners:
+            result['status'] = 'failed'
+        return result
+    finally:
+        result['wall_time'] = time.perf_counter() - start
+        for conn, (method, proc) in runners.items():
+            proc.terminate()
+        for conn, (method, proc) in runners.items():
+            proc.join()
+            conn.close()
+
+# -----------------------------
+# win bookkeeping
+# -----------------------------
+"""
+Runs races and keeps score. `wins` counts decided races per method, and
+ranking() lists the methods by wins. With `history` set, every race is
+appended to that file as one JSON line (puzzle, clues, status, winner,
+wall_time) for offline routing analysis.
+"""
+class Portfolio:
+    def __init__(self, methods=DEFAULT_METHODS, timeout=None, history=None):
+        self.methods = tuple(methods)
+        self.timeout = timeout
+        self.history = history
+        self.wins = Counter()
+
+    def solve(self, puzzle, stats=None):
+        result = race(puzzle, self.methods, self.timeout, stats)
+        if result['winner'] is not None:
+            self.wins[result['winner']] += 1
+        if self.history:
+            board = to_board(puzzle)
+            record = {
+                'puzzle': to_string(board),
+                'clues': sum(1 for row in board for v in row if v),
+                'status': result['status'],
+                'winner': result['winner'],
+                'wall_time': result['wall_time'],
+            }
+            with open(self.history, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        return result['board']
+
+    def ranking(self):
+        return sorted(self.methods, key=lambda m: -self.wins[m])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Race several Sudoku solvers on one puzzle.")
+    parser.add_argument("puzzle", help="81-character puzzle ('.' or '0' for empty cells)")
+    parser.add_argument("-m", "--methods", nargs='+', default=list(DEFAULT_METHODS),
+                        choices=sorted(set(METHODS) - NESTED),
+                        help="solvers to race (default: %s)" % ' '.join(DEFAULT_METHODS))
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before giving up")
+    args = parser.parse_args(argv)
+
+    result = race(args.puzzle, args.methods, args.timeout)
+    print("%s by %s in %.1f ms" % (result['status'], result['winner'], result['wall_time'] * 1000),
+          file=sys.stderr)
+    if result['board']:
+        print(to_string(result['board']))
+    return 0 if result['status'] == 'solved' else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
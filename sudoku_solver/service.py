@@ -0,0 +1,239 @@
+# Sudoku solve service
+# An asyncio TCP server that takes puzzles as JSON lines and solves them on
+# a process pool, so a hard puzzle never blocks the event loop or the
+# other connections.
+#
+#   python -m sudoku_solver.service --port 8765 -p 4
+#
+# Protocol: one JSON object per line in each direction.
+#
+#   -> {"id": 1, "puzzle": "53..7....6..195...", "method": "csp", "deadline": 2.0}
+#   <- {"id": 1, "status": "solved", "solution": "534678912...", "elapsed": 0.004}
+#
+# status is one of solved, unsolvable, timeout, busy or error. Replies on a
+# connection come back in completion order; "id" is echoed to match them.
+# {"op": "stats"} returns the service counters.
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import Exhausted, solve, to_board, to_string
+
+SERVICE_METHODS = ('csp', 'forward_checking', 'mac')
+
+# -----------------------------
+# worker side
+# -----------------------------
+# Returns the solution string, None when there is none, or False when the
+# job ran out of its `seconds`
+def solve_job(puzzle, method, seconds=None):
+    board = solve(puzzle, method, budget=seconds)
+    if isinstance(board, Exhausted):
+        return False
+    return to_string(board) if board else None
+
+# -----------------------------
+# service
+# -----------------------------
+"""
+Identical puzzles that are in flight at the same time (same grid, same
+method) share one job. Each request waits for its job with its own
+deadline. When the last request waiting on a job gives up, the job is
+cancelled; a job that a worker has already started runs on, but never
+longer than the service `deadline`, which is its search budget. Request
+deadlines longer than that still end in "timeout" once the job gives up.
+
+Backpressure works at two levels. Each connection has at most
+`max_pending` requests outstanding, and the service stops reading from
+that connection until one of them is answered. Across all connections at
+most `max_queue` jobs are queued or running; a request that would start
+another job gets "busy" straight away instead of waiting in line.
+"""
+class SolveService:
+    def __init__(self, processes=None, max_queue=256, max_pending=32, deadline=10.0):
+        self.processes = processes or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.max_pending = max_pending
+        self.deadline = deadline
+        self.executor = None
+        self.server = None
+        self.jobs = {}
+        self.connections = set()
+        self.inflight = 0
+        self.counters = dict.fromkeys(
+            ('requests', 'jobs', 'coalesced', 'solved', 'unsolvable', 'timeouts', 'busy', 'errors'), 0)
+
+    async def start(self, host='127.0.0.1', port=0):
+        self.executor = ProcessPoolExecutor(self.processes)
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            for task in self.connections:
+                task.cancel()
+            await asyncio.gather(*self.connections, return_exceptions=True)
+            await self.server.wait_closed()
+            self.server = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _job_done(self):
+        self.inflight -= 1
+
+    def _submit(self, key):
+        loop = asyncio.get_running_loop()
+
+        def done(_):
+            # runs in the executor's thread, possibly after the loop closed
+            try:
+                loop.call_soon_threadsafe(self._job_done)
+            except RuntimeError:
+                pass
+
+        work = self.executor.submit(solve_job, *key, self.deadline)
+        self.inflight += 1
+        work.add_done_callback(done)
+        job = [asyncio.wrap_future(work), 0]
+        self.jobs[key] = job
+        self.counters['jobs'] += 1
+        return job
+
+    async def solve(self, puzzle, method='csp', deadline=None):
+        self.counters['requests'] += 1
+        start = time.perf_counter()
+        if method not in SERVICE_METHODS:
+            self.counters['errors'] += 1
+            return {'status': 'error', 'error': 'method must be one of %s' % ', '.join(SERVICE_METHODS)}
+        try:
+            key = (to_string(to_board(puzzle)), method)
+        except (TypeError, ValueError) as exc:
+            self.counters['errors'] += 1
+            return {'status': 'error', 'error': str(exc)}
+
+        job = self.jobs.get(key)
+        if job is not None:
+            self.counters['coalesced'] += 1
+        elif self.inflight >= self.max_queue:
+            self.counters['busy'] += 1
+            return {'status': 'busy'}
+        else:
+            job = self._submit(key)
+
+        future = job[0]
+        job[1] += 1
+        try:
+            solution = await asyncio.wait_for(asyncio.shield(future), deadline or self.deadline)
+        except asyncio.TimeoutError:
+            self.counters['timeouts'] += 1
+            return {'status': 'timeout', 'elapsed': time.perf_counter() - start}
+        except Exception as exc:
+            self.counters['errors'] += 1
+            return {'status': 'error', 'error': '%s: %s' % (type(exc).__name__, exc)}
+        finally:
+            job[1] -= 1
+            if future.done() or job[1] == 0:
+                if self.jobs.get(key) is job:
+                    del self.jobs[key]
+                if not future.done():
+                    future.cancel()
+
+        if solution is False:
+            self.counters['timeouts'] += 1
+            return {'status': 'timeout', 'elapsed': time.perf_counter() - start}
+        if solution is None:
+            self.counters['unsolvable'] += 1
+            return {'status': 'unsolvable', 'elapsed': time.perf_counter() - start}
+        self.counters['solved'] += 1
+        return {'status': 'solved', 'solution': solution, 'elapsed': time.perf_counter() - start}
+
+    async def _answer(self, line, writer, slots):
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("expected a JSON object")
+            except ValueError as exc:
+                reply = {'status': 'error', 'error': 'bad request: %s' % exc}
+            else:
+                if request.get('op') == 'stats':
+                    reply = dict(self.counters, inflight=self.inflight)
+                else:
+                    reply = await self.solve(request.get('puzzle'), request.get('method', 'csp'),
+                                             request.get('deadline'))
+                if 'id' in request:
+                    reply['id'] = request['id']
+            writer.write(json.dumps(reply).encode() + b'\n')
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            slots.release()
+
+    async def handle(self, reader, writer):
+        slots = asyncio.Semaphore(self.max_pending)
+        tasks = set()
+        self.connections.add(asyncio.current_task())
+        try:
+            while True:
+                await slots.acquire()
+                line = await reader.readline()
+                if not line:
+                    slots.release()
+                    break
+                if not line.strip():
+                    slots.release()
+                    continue
+                task = asyncio.create_task(self._answer(line, writer, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.CancelledError):
+            for task in tasks:
+                task.cancel()
+        finally:
+            self.connections.discard(asyncio.current_task())
+            writer.close()
+
+
+async def serve(host, port, **options):
+    service = SolveService(**options)
+    host, port = await service.start(host, port)
+    print("listening on %s:%d" % (host, port), file=sys.stderr)
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Sudoku solves as JSON lines over TCP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--max-queue", type=int, default=256,
+                        help="jobs queued or running before requests get 'busy'")
+    parser.add_argument("--max-pending", type=int, default=32,
+                        help="outstanding requests per connection")
+    parser.add_argument("--deadline", type=float, default=10.0,
+                        help="default seconds a request may wait (default: 10)")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, processes=args.processes, max_queue=args.max_queue,
+                          max_pending=args.max_pending, deadline=args.deadline))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Search statistics
+# Solvers that take a `stats` argument count their work into it.
+# Passing stats=None (the default) skips all counting: every hook in the
+# solvers sits behind an `if stats is not None` test, so an uninstrumented
+# run does no extra work beyond that test.
+
+import time
+from contextlib import contextmanager, nullcontext
+
+class SearchStats:
+    """
+    nodes        → search states expanded (or iterations, for local search)
+    backtracks   → assignments undone after a dead end
+    max_depth    → deepest search level reached
+    max_frontier → largest open list / frontier held (A*, BFS)
+    restarts     → fresh starts of a local search
+    generations  → generations evolved by the genetic algorithm
+    best_score   → fewest conflicts reached by a local search
+    rules        → domain reductions made by each propagation rule
+    fired        → times each propagation rule reduced anything
+    timers       → seconds spent in each phase (see phase())
+    callbacks    → functions called as callback(event, stats, info)
+
+    propagations is the total of `rules`.
+    """
+    __slots__ = ('nodes', 'backtracks', 'max_depth', 'max_frontier', 'restarts',
+                 'generations', 'best_score', 'rules', 'fired', 'timers', 'callbacks')
+
+    def __init__(self, callbacks=()):
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.max_frontier = 0
+        self.restarts = 0
+        self.generations = 0
+        self.best_score = None
+        self.rules = {}
+        self.fired = {}
+        self.timers = {}
+        self.callbacks = list(callbacks)
+
+    @property
+    def propagations(self):
+        return sum(self.rules.values())
+
+    # one application of a propagation rule that made `reduced` reductions
+    def rule(self, name, reduced):
+        if reduced:
+            self.rules[name] = self.rules.get(name, 0) + reduced
+            self.fired[name] = self.fired.get(name, 0) + 1
+
+    def score(self, score):
+        if self.best_score is None or score < self.best_score:
+            self.best_score = score
+
+    def emit(self, event, **info):
+        for callback in self.callbacks:
+            callback(event, self, info)
+
+    """
+    Times the enclosed block and adds it to timers[name]; callbacks get a
+    "phase" event with the phase name and its duration.
+    """
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timers[name] = self.timers.get(name, 0.0) + elapsed
+            if self.callbacks:
+                self.emit('phase', phase=name, seconds=elapsed)
+
+    def as_dict(self):
+        return {
+            'nodes': self.nodes,
+            'backtracks': self.backtracks,
+            'propagations': self.propagations,
+            'max_depth': self.max_depth,
+            'max_frontier': self.max_frontier,
+            'restarts': self.restarts,
+            'generations': self.generations,
+            'best_score': self.best_score,
+            'rules': dict(self.rules),
+            'fired': dict(self.fired),
+            'timers': dict(self.timers),
+        }
+
+    def __repr__(self):
+        extra = ''.join(', %s=%r' % (k, v) for k, v in self.as_dict().items()
+                        if k not in ('nodes', 'backtracks') and v not in (None, {})
+                        and (v != 0 or k == 'best_score'))
+        return 'SearchStats(nodes=%d, backtracks=%d%s)' % (self.nodes, self.backtracks, extra)
+
+
+# stats.phase(name), or a no-op context when stats is None
+def phase(stats, name):
+    return nullcontext() if stats is None else stats.phase(name)
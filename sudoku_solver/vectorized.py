@@ -0,0 +1,135 @@
+# Batched CSP propagation
+# Holds B puzzles as a (B, 81) uint16 array of candidate masks (bit d-1 for
+# digit d, as in csp.py) and applies elimination and only_choice to the
+# whole batch with NumPy operations. Puzzles that propagation alone cannot
+# finish are handed to the scalar csp.search one by one.
+#
+#   from sudoku_solver import dataset, vectorized
+#   cells, solved = vectorized.solve_batch(dataset.parse(puzzles))
+
+import numpy as np
+
+from . import csp
+from .grid import geometry
+
+_GEO = geometry(3)
+FULL = csp.ALL
+UNITS = np.array(_GEO.units, dtype=np.intp)         # (27, 9) cells of each unit
+UNITS_OF = np.array(_GEO.units_of, dtype=np.intp)   # (81, 3) units of each cell
+POPCOUNT = np.array([bin(m).count('1') for m in range(FULL + 1)], dtype=np.uint8)
+# mask with one bit -> its digit (0 for anything else)
+DIGIT_OF = np.zeros(FULL + 1, dtype=np.uint8)
+DIGIT_OF[1 << np.arange(9)] = np.arange(1, 10)
+
+# -----------------------------
+# cells <-> masks
+# -----------------------------
+def to_masks(cells):
+    cells = np.asarray(cells, dtype=np.uint16)
+    return np.where(cells > 0, np.left_shift(1, np.maximum(cells, 1) - 1), FULL).astype(np.uint16)
+
+
+# (B, 81) digits, 0 where a cell is not down to one candidate
+def to_cells(masks):
+    return DIGIT_OF[masks]
+
+# -----------------------------
+# one round of both rules
+# -----------------------------
+"""
+Elimination: the digits of the solved cells of each unit are OR-ed
+together, and every unsolved cell loses the digits of its three units.
+
+only_choice: scanning a unit's cells in turn while keeping the digits
+seen at least once and at least twice gives the digits with exactly one
+place in the unit; a cell that holds such a digit is set to it.
+
+Returns the new masks and a (B,) array that is True for puzzles found to
+be contradictory: an empty cell, a digit solved twice in a unit, a digit
+with no place left in a unit, or a cell that must take two digits.
+"""
+def _once_twice(by_unit):
+    # digits seen at least once / at least twice across the last axis
+    once = by_unit[:, :, 0].copy()
+    twice = np.zeros_like(once)
+    for k in range(1, by_unit.shape[2]):
+        m = by_unit[:, :, k]
+        twice |= once & m
+        once |= m
+    return once, twice
+
+
+def _units_of(per_unit):
+    # (B, 27) -> (B, 81): OR of the values of each cell's three units
+    return per_unit[:, UNITS_OF[:, 0]] | per_unit[:, UNITS_OF[:, 1]] | per_unit[:, UNITS_OF[:, 2]]
+
+
+def propagate_step(masks):
+    single = POPCOUNT[masks] == 1
+    solved = np.where(single, masks, 0)
+    unit_solved, clash = _once_twice(solved[:, UNITS])               # (B, 27)
+    dead = clash.any(axis=1)
+
+    masks = np.where(single, masks, masks & ~_units_of(unit_solved))
+
+    once, twice = _once_twice(masks[:, UNITS])
+    dead |= (once != FULL).any(axis=1)
+
+    hidden = masks & _units_of(once & ~twice)
+    masks = np.where(hidden != 0, hidden, masks)
+    dead |= (masks == 0).any(axis=1) | (POPCOUNT[hidden] > 1).any(axis=1)
+    return masks, dead
+
+# -----------------------------
+# propagation to a fixed point
+# -----------------------------
+"""
+Repeats propagate_step until no puzzle changes. After every round only
+the puzzles that changed and are not dead are carried on, so a batch of
+mostly easy puzzles shrinks quickly. Returns (masks, dead); masks is a
+new array.
+"""
+def propagate(masks, stats=None):
+    masks = np.array(masks, dtype=np.uint16)
+    dead = np.zeros(len(masks), dtype=bool)
+    active = np.arange(len(masks))
+    while active.size:
+        before = masks[active]
+        after, failed = propagate_step(before)
+        masks[active] = after
+        dead[active[failed]] = True
+        if stats is not None:
+            stats.nodes += active.size
+            stats.rule('batch_propagate', int((after != before).sum()))
+        moving = (after != before).any(axis=1) & ~failed
+        active = active[moving]
+    return masks, dead
+
+# -----------------------------
+# batch solve
+# -----------------------------
+"""
+puzzles is a (B, 81) array of digits (0 for empty), such as
+dataset.parse() or PackedPuzzles.cells() return, or a list of
+81-character strings. Returns (cells, solved): the (B, 81) uint8
+solutions, with zero rows for puzzles without one, and a (B,) bool
+array. Puzzles left open by propagation go through csp.search. With
+stats, each puzzle counts one node per batch round, plus its search
+nodes if it needed a search.
+"""
+def solve_batch(puzzles, stats=None):
+    if len(puzzles) and isinstance(puzzles[0], str):
+        from .dataset import parse
+        puzzles = parse(puzzles)
+    masks, dead = propagate(to_masks(puzzles), stats)
+
+    done = (POPCOUNT[masks] == 1).all(axis=1) & ~dead
+    for i in np.flatnonzero(~done & ~dead):
+        result = csp.search(masks[i].tolist(), stats=stats)
+        if result is False:
+            dead[i] = True
+        else:
+            masks[i] = result
+    cells = to_cells(masks)
+    cells[dead] = 0
+    return cells, ~dead